@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Interactive REPL for driving a running tau-engine over its Unix socket.
+
+Commands that the REPL does not handle itself are forwarded verbatim to the
+engine and the reply is echoed back.  Run with no arguments for the
+interactive loop, ``-c CMD`` for a one-shot command, or ``-s FILE`` to replay
+a script of commands.
+
+Performance note: everything in this module is string, dict, and socket
+manipulation, which Numba does not accelerate (string-heavy code is a known
+poor fit and compile time would never amortize here).  Keep optimization in
+this file to data-structure and syscall-level work; JIT belongs in the
+numeric tau_lib algorithm kernels, not the REPL.
+"""
+
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Callable, List, Optional
+
+DEFAULT_SOCKET = Path("/tmp/tau-engine.sock")
+
+# The prompt is built once at import time: readline gets handed the same
+# string object every iteration, and we drop the ANSI color when stdout is
+# not a terminal (piped input still reaches the loop via `run`).
+_PROMPT = "\033[1;36mtau>\033[0m " if sys.stdout.isatty() else "tau> "
+
+# Help/banner text is pre-encoded so emitting it is a single buffer write
+# with no per-call encode step.
+_HELP_BYTES = b"""tau REPL commands:
+  help              show this text
+  history           list recent commands
+  quit / exit       leave the REPL
+
+Anything else is sent to the engine, e.g.:
+  STATUS            engine status line
+  PARAM <k> <v>     set a kernel parameter
+  SAMPLE <n> TRIG   trigger sample n
+"""
+_GOODBYE_BYTES = b"Goodbye!\n"
+
+
+class _TrieNode:
+    __slots__ = ("children", "items")
+
+    def __init__(self) -> None:
+        self.children: dict = {}
+        self.items: List[str] = []
+
+
+class CompletionTrie:
+    """Prefix trie over completion words.
+
+    Each node carries the words passing through it, so the completion
+    set for any prefix is a stored list, not a scan.  Built once per
+    provider/category; lookups walk one edge per typed character.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self, words: List[str]):
+        self.root = _TrieNode()
+        for word in words:
+            node = self.root
+            node.items.append(word)
+            for ch in word:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.items.append(word)
+
+
+class CompletionState:
+    """Tracks the tab-completion popup between keystrokes.
+
+    Deliberately a plain slotted class rather than a dataclass: the
+    generated ``__init__`` pays factory/sentinel dispatch per field and
+    keeps a per-instance ``__dict__``, while five STORE_ATTRs into slots
+    do the same job in a fraction of the space.
+    """
+
+    __slots__ = (
+        "items",
+        "visible",
+        "selected_index",
+        "current_category",
+        "provider",
+        "_trie",
+        "_trie_stack",
+        "_trie_provider",
+        "_trie_category",
+        "_matched_prefix",
+        "_n",
+    )
+
+    def __init__(self) -> None:
+        self.items: List[str] = []
+        self.visible = False
+        self.selected_index = 0
+        # Item count, maintained by update()/hide(): the per-keystroke
+        # selection moves read it instead of calling len().
+        self._n = 0
+        self.current_category: Optional[str] = None
+        self.provider: Optional[Callable] = None
+        # Incremental trie walk: the node stack mirrors the matched
+        # prefix, so extending the buffer steps one edge per new
+        # character and backspacing pops — no rescan per keystroke.
+        self._trie: Optional[CompletionTrie] = None
+        self._trie_stack: List[_TrieNode] = []
+        self._trie_provider: Optional[Callable] = None
+        self._trie_category: Optional[str] = None
+        self._matched_prefix = ""
+
+    def update(self, buffer: str) -> None:
+        if self.provider is None:
+            return
+        if (
+            self._trie is None
+            or self.provider is not self._trie_provider
+            or self.current_category != self._trie_category
+        ):
+            self._trie_provider = self.provider
+            self._trie_category = self.current_category
+            self._trie = CompletionTrie(self.provider("", self.current_category))
+            self._trie_stack = [self._trie.root]
+            self._matched_prefix = ""
+        normal = buffer.strip().lower()
+        stack = self._trie_stack
+        matched = self._matched_prefix
+        limit = min(len(normal), len(matched))
+        common = 0
+        while common < limit and normal[common] == matched[common]:
+            common += 1
+        del stack[common + 1:]
+        node = stack[-1]
+        for ch in normal[common:]:
+            nxt = node.children.get(ch)
+            if nxt is None:
+                break
+            stack.append(nxt)
+            node = nxt
+        walked = len(stack) - 1
+        self._matched_prefix = normal[:walked]
+        self.items = node.items if walked == len(normal) else []
+        self._n = len(self.items)
+        self.visible = self._n > 0
+        self.selected_index = 0
+
+    def select_next(self) -> None:
+        # Zero or one item: nothing to cycle, skip the modulo entirely.
+        n = self._n
+        if n > 1:
+            self.selected_index = (self.selected_index + 1) % n
+
+    def select_prev(self) -> None:
+        n = self._n
+        if n > 1:
+            self.selected_index = (self.selected_index - 1) % n
+
+    def hide(self) -> None:
+        self.items = []
+        self.visible = False
+        self.selected_index = 0
+        self._n = 0
+
+
+class TauREPL:
+    """Line-oriented shell around the tau-engine control socket."""
+
+    def __init__(self, socket_path: Path = DEFAULT_SOCKET, history_size: int = 200):
+        self.socket_path = Path(socket_path)
+        # Plain list: deque random access is O(index), and history_up/down
+        # index on every arrow keypress.  Append plus occasional front-trim
+        # keeps reads O(1).
+        self.history: List[str] = []
+        self._history_max = history_size
+        self.history_index = -1
+        self.completion = CompletionState()
+        self.running = False
+        # Set once the socket has been seen; saves a stat() per command.
+        self._socket_verified = False
+
+    # -- engine IPC --------------------------------------------------------
+
+    def _send_command(self, cmd: str, timeout: float = 1.0) -> str:
+        if not self._socket_verified:
+            if not self.socket_path.exists():
+                raise ConnectionError(f"engine socket not found: {self.socket_path}")
+            self._socket_verified = True
+        client_path = f"/tmp/tau-repl-{os.getpid()}.sock"
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            try:
+                os.unlink(client_path)
+            except OSError:
+                pass
+            client.bind(client_path)
+            client.settimeout(timeout)
+            try:
+                client.sendto(cmd.encode(), str(self.socket_path))
+                response, _ = client.recvfrom(16384)
+            except (socket.error, ConnectionError):
+                self._socket_verified = False
+                raise
+            return response.decode().strip()
+        finally:
+            client.close()
+            try:
+                os.unlink(client_path)
+            except OSError:
+                pass
+
+    # -- history -----------------------------------------------------------
+
+    def submit(self, cmd: str) -> None:
+        cmd = cmd.strip()
+        if not cmd:
+            return
+        self.history.append(cmd)
+        if len(self.history) > self._history_max:
+            del self.history[: len(self.history) - self._history_max]
+        self.history_index = -1
+        self.dispatch(cmd)
+
+    def history_up(self) -> Optional[str]:
+        if not self.history:
+            return None
+        if self.history_index < len(self.history) - 1:
+            self.history_index += 1
+        return self.history[len(self.history) - 1 - self.history_index]
+
+    def history_down(self) -> Optional[str]:
+        if self.history_index <= 0:
+            self.history_index = -1
+            return None
+        self.history_index -= 1
+        return self.history[len(self.history) - 1 - self.history_index]
+
+    # -- dispatch ----------------------------------------------------------
+
+    def dispatch(self, cmd: str) -> None:
+        # submit() never hands us a blank line, but -c on the CLI can.
+        cmd = cmd.strip()
+        if not cmd:
+            return
+        head = cmd.split(None, 1)[0].lower()
+        if head in ("quit", "exit"):
+            self.running = False
+        elif head == "help":
+            self.print_help()
+        elif head == "history":
+            for i, entry in enumerate(self.history):
+                print(f"{i + 1:4d}  {entry}")
+        else:
+            try:
+                print(self._send_command(cmd))
+            except (ConnectionError, socket.error) as exc:
+                print(f"error: {exc}", file=sys.stderr)
+
+    def print_help(self) -> None:
+        sys.stdout.buffer.write(_HELP_BYTES)
+        sys.stdout.flush()
+
+    # -- main loop ---------------------------------------------------------
+
+    def run(self) -> None:
+        print(f"tau REPL (engine: {self.socket_path})")
+        self.running = True
+        while self.running:
+            try:
+                cmd = input(_PROMPT)
+            except (EOFError, KeyboardInterrupt):
+                print()
+                break
+            self.submit(cmd)
+        sys.stdout.buffer.write(_GOODBYE_BYTES)
+        sys.stdout.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-c", "--command", help="send one command and exit")
+    parser.add_argument("-s", "--script", help="run commands from a file")
+    parser.add_argument("--socket", default=str(DEFAULT_SOCKET), help="engine socket path")
+    args = parser.parse_args(argv)
+
+    repl = TauREPL(socket_path=Path(args.socket))
+    if args.command:
+        repl.dispatch(args.command)
+        return 0
+    if args.script:
+        for line in Path(args.script).read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                repl.dispatch(line)
+        return 0
+    repl.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Shared library for the tau demos: pulse analysis, algorithms, CLI glue."""
@@ -0,0 +1,73 @@
+"""Pluggable spike-detection algorithms.
+
+Currently ships one backend:
+
+* ``tscale`` — dual-tau SNN spike detector, a small C binary driven over
+  subprocess (see :mod:`tau_lib.algorithms.tscale.wrapper`).
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+
+
+class Algorithm(ABC):
+    """Base class for detection backends."""
+
+    name: str = "base"
+    version: str = "0.0.0"
+
+    def __init__(self, params=None):
+        # Resolved once: params is always a usable object after this, so
+        # run()/validate_params() never re-allocate defaults per call.
+        self.params = params if params is not None else self.default_params()
+
+    @abstractmethod
+    def default_params(self):
+        """Return a fresh default parameter object."""
+
+    @abstractmethod
+    def validate_params(self) -> List[str]:
+        """Return a list of human-readable problems (empty when valid)."""
+
+    @abstractmethod
+    def run(self, input_path, output_path=None) -> Dict[str, object]:
+        """Process one input file and return the result record."""
+
+
+# Bare module-level registry: lookups from the command loop skip the
+# classmethod descriptor and bound-method allocation entirely.
+_REGISTRY: Dict[str, Type[Algorithm]] = {}
+
+
+def register(algo_cls: Type[Algorithm]) -> Type[Algorithm]:
+    _REGISTRY[algo_cls.name] = algo_cls
+    return algo_cls
+
+
+def get(name: str) -> Optional[Type[Algorithm]]:
+    return _REGISTRY.get(name)
+
+
+def list_algorithms() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+def create(name: str, params=None) -> Algorithm:
+    algo_cls = _REGISTRY.get(name)
+    if algo_cls is None:
+        raise KeyError(f"unknown algorithm: {name}")
+    return algo_cls(params)
+
+
+class AlgorithmRegistry:
+    """Compat shim over the module-level registry functions."""
+
+    register = staticmethod(register)
+    get = staticmethod(get)
+    list = staticmethod(list_algorithms)
+    create = staticmethod(create)
+
+
+from tau_lib.algorithms.tscale.wrapper import TscaleAlgorithm, TscaleParams  # noqa: E402
+
+register(TscaleAlgorithm)
@@ -0,0 +1 @@
+"""Dual-tau SNN spike detector backend."""
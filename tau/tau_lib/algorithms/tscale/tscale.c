@@ -0,0 +1,67 @@
+/* tscale - dual-tau spike detector.
+ *
+ * Reads one float sample per line from -i (or stdin), runs a pair of
+ * one-pole lowpass filters with different time constants, and reports a
+ * spike whenever the fast-minus-slow envelope crosses the threshold
+ * outside the refractory window.  Output is TSV: time<TAB>value.
+ *
+ * Usage: tscale -i in.txt -o out.tsv [-a tau_a] [-r tau_r]
+ *               [-t threshold] [-d refractory] [-f fs]
+ * Pass "-" for -o to write to stdout.
+ */
+#include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+int main(int argc, char **argv) {
+    const char *in_path = NULL, *out_path = NULL;
+    double tau_a = 0.001, tau_r = 0.010;
+    double threshold = 0.5, refractory = 0.002;
+    double fs = 48000.0;
+
+    for (int i = 1; i < argc - 1; i++) {
+        if (!strcmp(argv[i], "-i")) in_path = argv[++i];
+        else if (!strcmp(argv[i], "-o")) out_path = argv[++i];
+        else if (!strcmp(argv[i], "-a")) tau_a = atof(argv[++i]);
+        else if (!strcmp(argv[i], "-r")) tau_r = atof(argv[++i]);
+        else if (!strcmp(argv[i], "-t")) threshold = atof(argv[++i]);
+        else if (!strcmp(argv[i], "-d")) refractory = atof(argv[++i]);
+        else if (!strcmp(argv[i], "-f")) fs = atof(argv[++i]);
+    }
+    for (int i = 1; i < argc; i++) {
+        if (!strcmp(argv[i], "--help") || !strcmp(argv[i], "--version")) {
+            printf("tscale 0.3.0\n");
+            return 0;
+        }
+    }
+
+    FILE *in = in_path ? fopen(in_path, "r") : stdin;
+    if (!in) { perror("tscale: input"); return 1; }
+    FILE *out = (!out_path || !strcmp(out_path, "-")) ? stdout : fopen(out_path, "w");
+    if (!out) { perror("tscale: output"); return 1; }
+
+    double ka = exp(-1.0 / (tau_a * fs));
+    double kr = exp(-1.0 / (tau_r * fs));
+    double ya = 0.0, yr = 0.0;
+    double last_spike = -1.0;
+    long n = 0;
+    double x;
+
+    while (fscanf(in, "%lf", &x) == 1) {
+        double ax = fabs(x);
+        ya = ka * ya + (1.0 - ka) * ax;
+        yr = kr * yr + (1.0 - kr) * ax;
+        double env = ya - yr;
+        double t = (double)n / fs;
+        if (env > threshold && (last_spike < 0.0 || t - last_spike >= refractory)) {
+            fprintf(out, "%.6f\t%.6f\n", t, env);
+            last_spike = t;
+        }
+        n++;
+    }
+
+    if (in != stdin) fclose(in);
+    if (out != stdout) fclose(out);
+    return 0;
+}
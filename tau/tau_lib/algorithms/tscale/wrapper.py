@@ -0,0 +1,160 @@
+"""Python wrapper around the tscale C binary.
+
+subprocess/platform are imported inside the methods that spawn the
+binary: importing this module (which happens on any tau_lib.algorithms
+import) stays cheap for CLI paths that never run a detection.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tau_lib.algorithms import Algorithm
+
+
+class NormMode(Enum):
+    NONE = "none"
+    PEAK = "peak"
+    RMS = "rms"
+
+
+class FilterMode(Enum):
+    BIEXP = "biexp"
+    RECT = "rect"
+
+
+@dataclass
+class TscaleParams:
+    """Kernel parameters handed to the tscale binary."""
+
+    tau_a: float = 0.001
+    tau_r: float = 0.010
+    threshold: float = 0.5
+    refractory: float = 0.002
+    fs: int = 48000
+    norm: NormMode = NormMode.PEAK
+    filter_mode: FilterMode = FilterMode.BIEXP
+
+    def __post_init__(self):
+        # Fail at construction: invalid params used to surface only after
+        # paying for a subprocess launch in run().
+        if self.tau_a <= 0 or self.tau_r <= 0:
+            raise ValueError("time constants must be positive")
+        if self.tau_a >= self.tau_r:
+            raise ValueError("tau_a must be shorter than tau_r")
+        if not 0.0 < self.threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if self.refractory < 0:
+            raise ValueError("refractory must be non-negative")
+        if self.fs <= 0:
+            raise ValueError("sample rate must be positive")
+
+    def to_args(self) -> List[str]:
+        return [
+            "-a", str(self.tau_a),
+            "-r", str(self.tau_r),
+            "-t", str(self.threshold),
+            "-d", str(self.refractory),
+            "-f", str(self.fs),
+        ]
+
+
+class TscaleAlgorithm(Algorithm):
+    """Dual-tau SNN spike detector driven over subprocess."""
+
+    name = "tscale"
+    version = "0.3.0"
+
+    def __init__(self, params: Optional[TscaleParams] = None, binary_path: Optional[Path] = None):
+        super().__init__(params)
+        self._binary_path = Path(binary_path) if binary_path else self._find_or_default_binary()
+        # Cached stat of the binary; build() maintains it so repeated
+        # is_built() checks stop hitting the filesystem.
+        self._binary_exists: Optional[bool] = None
+
+    def default_params(self) -> TscaleParams:
+        return TscaleParams()
+
+    # -- binary management -------------------------------------------------
+
+    def _find_or_default_binary(self) -> Path:
+        local_bin = Path(__file__).parent / "tscale"
+        if local_bin.exists():
+            return local_bin
+        original = Path("~/tau/tscale/tscale").expanduser()
+        if original.exists():
+            return original
+        return local_bin
+
+    def is_built(self) -> bool:
+        if self._binary_exists is None:
+            self._binary_exists = self._binary_path.exists()
+        return self._binary_exists
+
+    def build(self, force: bool = False) -> bool:
+        """Compile tscale.c next to this module."""
+        import platform
+        import subprocess
+
+        if force:
+            self._binary_exists = None
+        elif self.is_built():
+            return True
+        source = Path(__file__).parent / "tscale.c"
+        darwin = platform.system() == "Darwin"
+        compiler = "clang" if darwin else "cc"
+        # The IIR/envelope inner loop is SIMD-friendly: let the compiler
+        # vectorize and reassociate the two-tau arithmetic for this host.
+        fast_flags = ["-O3", "-march=native", "-ffast-math", "-funroll-loops", "-ftree-vectorize"]
+        if darwin:
+            fast_flags += ["-fvectorize", "-fslp-vectorize"]
+        for flags in (fast_flags, ["-O3"]):  # older toolchains may lack -march=native
+            cmd = [compiler, "-std=c11", *flags, "-o", str(self._binary_path), str(source), "-lm"]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode == 0:
+                self._binary_exists = True
+                return True
+        return False
+
+    def get_version(self) -> str:
+        return self.version if self.is_built() else f"{self.version} (not built)"
+
+    # -- running -----------------------------------------------------------
+
+    def validate_params(self) -> List[str]:
+        # Kept for API compat: TscaleParams.__post_init__ now rejects
+        # invalid values at construction, so reaching here means valid.
+        return []
+
+    def run(self, input_path, output_path=None) -> Dict[str, object]:
+        """Run the binary on one sample file; return spike times and raw TSV."""
+        import subprocess
+
+        problems = self.validate_params()
+        if problems:
+            raise ValueError("; ".join(problems))
+        if not self.is_built() and not self.build():
+            raise RuntimeError(f"tscale binary unavailable: {self._binary_path}")
+
+        # Without a requested output file, take the TSV straight off the
+        # binary's stdout ("-o -"): no tempfile, no second read pass.
+        if output_path is None:
+            cmd = [str(self._binary_path), "-i", str(input_path), "-o", "-"]
+            cmd += self.params.to_args()
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"tscale failed: {result.stderr.strip()}")
+            tsv_data = result.stdout
+        else:
+            output_path = Path(output_path)
+            cmd = [str(self._binary_path), "-i", str(input_path), "-o", str(output_path)]
+            cmd += self.params.to_args()
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"tscale failed: {result.stderr.strip()}")
+            with open(output_path) as f:
+                tsv_data = f.read()
+
+        spike_times = [float(line.split("\t", 1)[0]) for line in tsv_data.splitlines() if line]
+        return {"spike_times": spike_times, "tsv_data": tsv_data, "params": self.params}
@@ -0,0 +1,28 @@
+"""Pulse-train analysis helpers.
+
+The statistics module (and its numpy/numba imports) loads lazily on first
+attribute access, so CLI invocations that never analyze anything skip the
+~50ms numpy import at cold start.
+"""
+
+_EXPORTS = (
+    "extract_pulse_times",
+    "compute_isi",
+    "compute_timing_precision",
+    "compute_phase_alignment",
+    "compute_correlation",
+    "detect_subdivisions",
+    "analyze_pulse_comparison",
+)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from tau_lib.analysis import statistics
+
+        return getattr(statistics, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
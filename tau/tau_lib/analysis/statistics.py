@@ -0,0 +1,223 @@
+"""Timing statistics over extracted pulse trains.
+
+A "pulse train" here is a sorted list of event times (seconds) pulled out of
+the scope's data buffer with :func:`extract_pulse_times`.  The comparison
+helpers answer questions like "is pulse2 a subdivision of pulse1" and "how
+tight is the timing".
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is optional
+    numba = None
+
+# Subdivision ratios we test phase alignment against.
+_DIVISORS = (1, 2, 3, 4, 6, 8)
+
+
+def _count_in_intervals(p1, p2):
+    """Count pulse2 events strictly inside each consecutive pulse1 interval.
+
+    Both arrays are sorted, so a single index walks p2 once — O(N+M).
+    Written as a scalar loop so numba can compile it to native code; the
+    pure-Python fallback keeps the same linear complexity.
+    """
+    counts = np.zeros(len(p1) - 1, dtype=np.int64)
+    j = 0
+    n2 = len(p2)
+    for i in range(len(p1) - 1):
+        start = p1[i]
+        end = p1[i + 1]
+        while j < n2 and p2[j] <= start:
+            j += 1
+        k = j
+        c = 0
+        while k < n2 and p2[k] < end:
+            c += 1
+            k += 1
+        counts[i] = c
+    return counts
+
+
+if numba is not None:
+    _count_in_intervals = numba.njit(cache=True)(_count_in_intervals)
+
+
+def extract_pulse_times(data_buffer: List[tuple], channel: int, threshold: float = 0.5) -> List[float]:
+    """Return times of upward threshold crossings on one channel."""
+    times = []
+    prev = 0.0
+    for t, values in data_buffer:
+        v = values[channel]
+        if v >= threshold and prev < threshold:
+            times.append(t)
+        prev = v
+    return times
+
+
+def compute_isi(pulse_times: List[float]) -> List[float]:
+    """Inter-spike intervals between consecutive pulses."""
+    return [b - a for a, b in zip(pulse_times, pulse_times[1:])]
+
+
+def compute_timing_precision(
+    pulse_times: List[float],
+    precomputed_isis: Optional[List[float]] = None,
+) -> Dict[str, float]:
+    """Mean/std/MAD of the inter-spike intervals.
+
+    One list-to-array conversion and one shared deviation array: std and
+    MAD both reduce over ``dev`` rather than re-scanning the data, so the
+    stats block moves roughly a third of the bytes it used to.  Callers
+    that already extracted the ISIs can pass them in.
+    """
+    isis = precomputed_isis if precomputed_isis is not None else compute_isi(pulse_times)
+    if not isis:
+        return {"mean_isi": 0.0, "std_isi": 0.0, "mad_isi": 0.0, "cv": 0.0}
+    isis = np.asarray(isis, dtype=np.float64)
+    mean_isi = isis.mean()
+    dev = isis - mean_isi
+    std_isi = np.sqrt((dev * dev).mean())
+    mad_isi = np.abs(dev).mean()
+    cv = std_isi / mean_isi if mean_isi else 0.0
+    return {
+        "mean_isi": float(mean_isi),
+        "std_isi": float(std_isi),
+        "mad_isi": float(mad_isi),
+        "cv": float(cv),
+    }
+
+
+def compute_phase_alignment(
+    pulse1_times: List[float],
+    pulse2_times: List[float],
+    tolerance: float = 0.01,
+    mean_period: Optional[float] = None,
+) -> Dict[str, float]:
+    """Fraction of pulse2 events landing on a subdivision of the pulse1 grid.
+
+    Fully vectorized: ``searchsorted`` batches the "previous pulse1" lookup
+    for every pulse2 at once, and the divisor targets are tested with one
+    broadcast compare instead of the old O(N*M) Python loops.
+    """
+    if len(pulse1_times) < 2 or not pulse2_times:
+        return {"aligned_count": 0, "total": len(pulse2_times), "alignment_ratio": 0.0}
+
+    p1 = np.asarray(pulse1_times, dtype=np.float64)
+    p2 = np.asarray(pulse2_times, dtype=np.float64)
+    if mean_period is None:
+        mean_period = float(np.mean(np.diff(p1)))
+    if mean_period <= 0.0:
+        return {"aligned_count": 0, "total": len(p2), "alignment_ratio": 0.0}
+
+    idx = np.searchsorted(p1, p2, side="right") - 1
+    mask = idx >= 0
+    phase = np.mod(p2[mask] - p1[idx[mask]], mean_period)
+
+    targets = np.concatenate([np.arange(d) * (mean_period / d) for d in _DIVISORS])
+    aligned = (np.abs(phase[:, None] - targets[None, :]) < tolerance).any(axis=1)
+    aligned_count = int(aligned.sum())
+    return {
+        "aligned_count": aligned_count,
+        "total": len(p2),
+        "alignment_ratio": aligned_count / len(p2),
+    }
+
+
+def compute_correlation(
+    pulse1_times: List[float],
+    pulse2_times: List[float],
+    window: float = 0.05,
+) -> Dict[str, float]:
+    """Fraction of pulse2 events with a pulse1 event within ``window``.
+
+    Pulse trains arrive time-sorted, so the nearest pulse1 for every pulse2
+    is found with one searchsorted pass — O(N+M) in C instead of the old
+    quadratic Python scan.
+    """
+    if not pulse1_times or not pulse2_times:
+        return {"overlap_count": 0, "total": len(pulse2_times), "overlap_ratio": 0.0}
+    p1 = np.asarray(pulse1_times, dtype=np.float64)
+    p2 = np.asarray(pulse2_times, dtype=np.float64)
+    idx = np.clip(np.searchsorted(p1, p2), 1, len(p1) - 1) if len(p1) > 1 else np.zeros(len(p2), dtype=np.intp)
+    if len(p1) > 1:
+        dist = np.minimum(np.abs(p2 - p1[idx]), np.abs(p2 - p1[idx - 1]))
+    else:
+        dist = np.abs(p2 - p1[0])
+    overlap_count = int((dist < window).sum())
+    return {
+        "overlap_count": overlap_count,
+        "total": len(pulse2_times),
+        "overlap_ratio": overlap_count / len(pulse2_times),
+    }
+
+
+def detect_subdivisions(
+    pulse1_times: List[float],
+    pulse2_times: List[float],
+) -> Dict[str, object]:
+    """Histogram of how many pulse2 events fall inside each pulse1 interval."""
+    if len(pulse1_times) < 2:
+        return {"histogram": {}, "dominant": 0}
+    p1 = np.ascontiguousarray(pulse1_times, dtype=np.float64)
+    p2 = np.ascontiguousarray(pulse2_times, dtype=np.float64)
+    subdivision_counts = _count_in_intervals(p1, p2)
+    # bincount builds the whole histogram in one C pass; counts are small
+    # non-negative ints so the dense array stays tiny.
+    bc = np.bincount(subdivision_counts)
+    histogram = {int(i): int(bc[i]) for i in np.nonzero(bc)[0]}
+    dominant = max(histogram, key=histogram.get) if histogram else 0
+    return {"histogram": histogram, "dominant": dominant}
+
+
+# Pulse extraction memo for live refresh loops: keyed on buffer identity,
+# length, and channel so a buffer that has not grown is never re-walked.
+# Each entry pins the keyed buffer, so its id cannot be recycled by a
+# new object while the entry lives; eviction is LRU (hits refresh
+# recency), bounded small since entries are per (buffer, channel).
+_PULSE_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_PULSE_CACHE_MAX = 16
+
+
+def _cached_pulse_times(data_buffer: List[tuple], channel: int) -> List[float]:
+    key = (id(data_buffer), len(data_buffer), channel)
+    entry = _PULSE_CACHE.get(key)
+    if entry is not None and entry[0] is data_buffer:
+        _PULSE_CACHE.move_to_end(key)
+        return entry[1]
+    times = extract_pulse_times(data_buffer, channel)
+    _PULSE_CACHE[key] = (data_buffer, times)
+    _PULSE_CACHE.move_to_end(key)
+    if len(_PULSE_CACHE) > _PULSE_CACHE_MAX:
+        _PULSE_CACHE.popitem(last=False)
+    return times
+
+
+def analyze_pulse_comparison(
+    data_buffer: List[tuple],
+    pulse1_ch: int,
+    pulse2_ch: int,
+) -> Dict[str, object]:
+    """Full comparison report between two pulse channels."""
+    pulse1_times = _cached_pulse_times(data_buffer, pulse1_ch)
+    pulse2_times = _cached_pulse_times(data_buffer, pulse2_ch)
+    # Extract the pulse1 intervals once and share them: precision, phase
+    # alignment, and the period all used to re-derive the same ISIs.
+    p1_isis = compute_isi(pulse1_times)
+    mean_period = sum(p1_isis) / len(p1_isis) if p1_isis else 0.0
+    return {
+        "pulse1_count": len(pulse1_times),
+        "pulse2_count": len(pulse2_times),
+        "pulse1_precision": compute_timing_precision(pulse1_times, precomputed_isis=p1_isis),
+        "pulse2_precision": compute_timing_precision(pulse2_times),
+        "correlation": compute_correlation(pulse1_times, pulse2_times),
+        "phase_alignment": compute_phase_alignment(
+            pulse1_times, pulse2_times, mean_period=mean_period or None
+        ),
+        "subdivisions": detect_subdivisions(pulse1_times, pulse2_times),
+    }
@@ -0,0 +1 @@
+"""CLI support code shared by the tau REPL and one-shot commands."""
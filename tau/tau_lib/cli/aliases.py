@@ -0,0 +1,92 @@
+"""User-defined command aliases, persisted to a small TOML file."""
+
+import hashlib
+import os
+import tomllib
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import tomli_w as toml_writer
+except ImportError:  # pragma: no cover - tomli_w is optional
+    toml_writer = None
+
+DEFAULT_ALIASES_PATH = Path("~/.config/tau/aliases.toml").expanduser()
+
+
+def _dumps(aliases: Dict[str, str]) -> bytes:
+    if toml_writer is not None:
+        return toml_writer.dumps({"aliases": aliases}).encode()
+    lines = ["[aliases]\n"]
+    for name, expansion in sorted(aliases.items()):
+        escaped = expansion.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'{name} = "{escaped}"\n')
+    return "".join(lines).encode()
+
+
+class AliasManager:
+    """Loads, resolves, and persists ``alias -> expansion`` mappings."""
+
+    def __init__(self, path: Path = DEFAULT_ALIASES_PATH):
+        self.path = Path(path)
+        self.aliases: Dict[str, str] = {}
+        self._last_hash: Optional[bytes] = None
+        self.load()
+
+    def load(self) -> None:
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        self.aliases = tomllib.loads(raw.decode()).get("aliases", {})
+        self._last_hash = hashlib.blake2b(_dumps(self.aliases)).digest()
+
+    def save(self) -> None:
+        """Write atomically, and only when the content actually changed.
+
+        Mutations trigger a save each, so a burst of `alias` commands
+        would otherwise rewrite the whole file repeatedly; the hash gate
+        skips no-op writes and os.replace keeps a crash from leaving a
+        half-written file behind.
+        """
+        payload = _dumps(self.aliases)
+        digest = hashlib.blake2b(payload).digest()
+        if digest == self._last_hash:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, self.path)
+        self._last_hash = digest
+
+    def set(self, name: str, expansion: str) -> None:
+        self.aliases[name] = expansion
+        self.save()
+
+    def remove(self, name: str) -> bool:
+        if name not in self.aliases:
+            return False
+        del self.aliases[name]
+        self.save()
+        return True
+
+    def resolve(self, cmd_str: str) -> str:
+        """Expand a leading alias, leaving the rest of the line intact.
+
+        The common case is "no alias matched" (every built-in command),
+        so find the head with a plain index scan first and only pay for
+        strip/split once a candidate key is actually present.
+        """
+        sp = cmd_str.find(" ")
+        head = cmd_str if sp < 0 else cmd_str[:sp]
+        if head not in self.aliases:
+            # The fast path only trusts a clean miss: an empty head
+            # (leading space) or one holding tabs/newlines may still
+            # hide an alias, so those take the strip/split route.
+            if head and not any(map(str.isspace, head)):
+                return cmd_str
+        parts = cmd_str.strip().split(None, 1)
+        if not parts or parts[0] not in self.aliases:
+            return cmd_str
+        expansion = self.aliases[parts[0]]
+        return f"{expansion} {parts[1]}" if len(parts) > 1 else expansion
@@ -0,0 +1,363 @@
+"""Command metadata and registry for the scope CLI/OSC surface.
+
+Every user-facing verb is described by a :class:`CommandDef`; the registry
+backs tab completion, help text, OSC address mapping, and the generated API
+document.
+"""
+
+from bisect import bisect_left, insort
+from itertools import groupby
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+
+class ParamType(Enum):
+    FLOAT = "float"
+    INT = "int"
+    BOOL = "bool"
+    STRING = "string"
+    ENUM = "enum"
+
+
+_OSC_TYPE_MAP = {ParamType.FLOAT: "f", ParamType.INT: "i", ParamType.BOOL: "i"}
+
+
+@dataclass(frozen=True, slots=True)
+class _Category:
+    """Command group; the int is the display color pair.
+
+    Plain frozen singletons rather than an Enum: attribute access is a
+    direct slot read (no Enum metaclass machinery), aliases are literal
+    rebindings, and iteration over ALL_CATEGORIES is exact.
+    """
+
+    category_name: str
+    color: int
+
+
+TRANSPORT = _Category("transport", 1)
+PARAMS = _Category("params", 2)
+LANES = _Category("lanes", 3)
+MARKERS = _Category("markers", 4)
+VIEW = _Category("view", 5)
+SYSTEM = _Category("system", 6)
+# Alias: zoom commands live with transport.
+ZOOM = TRANSPORT
+
+ALL_CATEGORIES = (TRANSPORT, PARAMS, LANES, MARKERS, VIEW, SYSTEM)
+
+
+class CommandCategory:
+    """Namespace kept so callers can keep spelling CommandCategory.X."""
+
+    TRANSPORT = TRANSPORT
+    PARAMS = PARAMS
+    LANES = LANES
+    MARKERS = MARKERS
+    VIEW = VIEW
+    SYSTEM = SYSTEM
+    ZOOM = ZOOM
+
+
+@dataclass(slots=True)
+class CommandParam:
+    """One positional parameter of a command.
+
+    slots=True: these instances are created once but read on every
+    completion/invoke, so attribute access should be an offset fetch and
+    the registry should pack densely.
+    """
+
+    name: str
+    type: ParamType = ParamType.STRING
+    default: object = None
+    min_val: Optional[float] = None
+    max_val: Optional[float] = None
+    choices: Optional[tuple] = None
+    help: str = ""
+    _spec_str: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.choices is not None:
+            self.choices = tuple(self.choices)
+        self._spec_str = self._build_format_spec()
+
+    def get_osc_type(self) -> str:
+        return _OSC_TYPE_MAP.get(self.type, "s")
+
+    def _build_format_spec(self) -> str:
+        parts = [self.name]
+        if self.type != ParamType.STRING:
+            parts.append(f":{self.type.value}")
+        if self.min_val is not None or self.max_val is not None:
+            parts.append(f"[{self.min_val}..{self.max_val}]")
+        if self.choices:
+            parts.append("{" + "|".join(str(c) for c in self.choices) + "}")
+        return "".join(parts)
+
+    def format_spec(self) -> str:
+        # Params are immutable after construction; the spec is built once.
+        return self._spec_str
+
+    def convert(self, raw):
+        """Parse and bounds-check one raw argument string."""
+        if self.type == ParamType.FLOAT:
+            value = float(raw)
+        elif self.type == ParamType.INT:
+            value = int(raw)
+        elif self.type == ParamType.BOOL:
+            value = str(raw).lower() in ("1", "true", "on", "yes")
+        else:
+            value = str(raw)
+        if self.min_val is not None and value < self.min_val:
+            raise ValueError(f"{self.name} below minimum {self.min_val}")
+        if self.max_val is not None and value > self.max_val:
+            raise ValueError(f"{self.name} above maximum {self.max_val}")
+        if self.choices and value not in self.choices:
+            raise ValueError(f"{self.name} must be one of {self.choices}")
+        return value
+
+
+@dataclass(slots=True)
+class CommandDef:
+    """A registered command: handler plus everything needed to present it."""
+
+    name: str
+    handler: Callable
+    category: _Category = SYSTEM
+    params: List[CommandParam] = field(default_factory=list)
+    aliases: tuple = ()
+    help: str = ""
+    hidden: bool = False
+    _osc_address: str = field(init=False, repr=False)
+    _osc_signature: str = field(init=False, repr=False)
+    _color: int = field(init=False, repr=False)
+    _compiled_validator: Optional[Callable] = field(init=False, repr=False)
+    _usage_str: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # These are immutable after construction and hit inside the doc
+        # export and handler-registration loops: build the strings once.
+        self.aliases = tuple(self.aliases)
+        self._osc_address = f"/snn/{self.category.category_name}/{self.name}"
+        self._osc_signature = "".join(p.get_osc_type() for p in self.params)
+        self._color = self.category.color
+        # Filled in by CommandRegistry.register with a specialized closure.
+        self._compiled_validator = None
+        self._usage_str = self._build_format_usage()
+
+    def get_osc_address(self) -> str:
+        return self._osc_address
+
+    def get_osc_signature(self) -> str:
+        return self._osc_signature
+
+    def get_color(self) -> int:
+        return self._color
+
+    def _build_format_usage(self) -> str:
+        parts = [self.name]
+        for p in self.params:
+            if p.default is None:
+                parts.append(f"<{p.format_spec()}>")
+            else:
+                parts.append(f"[{p.format_spec()}]")
+        return " ".join(parts)
+
+    def format_usage(self) -> str:
+        return self._usage_str
+
+    def invoke(self, args: List[str]):
+        """Validate/convert args against params and call the handler."""
+        validator = self._compiled_validator
+        if validator is not None:
+            return self.handler(*validator(args))
+        converted = []
+        for i, param in enumerate(self.params):
+            if i < len(args):
+                converted.append(param.convert(args[i]))
+            elif param.default is not None:
+                converted.append(param.default)
+            else:
+                raise ValueError(f"missing argument: {param.name}")
+        return self.handler(*converted)
+
+    def format_help(self) -> str:
+        lines = [f"{self.format_usage()}  — {self.help}"]
+        lines.append(f"    OSC: {self.get_osc_address()} ({self.get_osc_signature() or 'no args'})")
+        if self.aliases:
+            lines.append(f"    aliases: {', '.join(self.aliases)}")
+        return "\n".join(lines)
+
+
+def _to_bool(raw) -> bool:
+    return str(raw).lower() in ("1", "true", "on", "yes")
+
+
+_CONVERTERS = {ParamType.FLOAT: float, ParamType.INT: int, ParamType.BOOL: _to_bool}
+
+
+def _build_validator(cmd: CommandDef) -> Callable:
+    """Specialize argument validation for one command at registration.
+
+    The param metadata is walked exactly once here; the returned closure
+    hard-codes each parameter's converter, bounds, and choice set so
+    invoke() never re-reads the metadata on the hot path.  Checks that a
+    param does not declare are simply absent from its step.
+    """
+    steps = []
+    for p in cmd.params:
+        conv = _CONVERTERS.get(p.type, str)
+        lo, hi, name = p.min_val, p.max_val, p.name
+        choices = frozenset(p.choices) if p.choices else None
+        if lo is None and hi is None and choices is None:
+            step = conv
+        else:
+            def step(raw, conv=conv, lo=lo, hi=hi, choices=choices, name=name):
+                value = conv(raw)
+                if lo is not None and value < lo:
+                    raise ValueError(f"{name} below minimum {lo}")
+                if hi is not None and value > hi:
+                    raise ValueError(f"{name} above maximum {hi}")
+                if choices is not None and value not in choices:
+                    raise ValueError(f"{name} must be one of {tuple(choices)}")
+                return value
+        steps.append((step, p.default, name))
+
+    def validator(args):
+        converted = []
+        n = len(args)
+        for i, (step, default, name) in enumerate(steps):
+            if i < n:
+                converted.append(step(args[i]))
+            elif default is not None:
+                converted.append(default)
+            else:
+                raise ValueError(f"missing argument: {name}")
+        return converted
+
+    return validator
+
+
+class CommandRegistry:
+    """Name/alias -> CommandDef mapping with prefix completion support."""
+
+    def __init__(self):
+        self.commands: Dict[str, CommandDef] = {}
+        # Sorted, aligned arrays over names and aliases.  At our registry
+        # sizes a bisect over one contiguous string array beats the trie
+        # this replaced: two binary searches bound the prefix range and
+        # the result is a slice, with no pointer-chasing per character.
+        self._sorted_names: List[str] = []
+        self._sorted_cmds: List[CommandDef] = []
+        # Visible-only indexes maintained at registration so listing
+        # calls stop re-filtering cmd.hidden on every invocation.
+        self._visible_sorted: List[CommandDef] = []
+        self._visible_by_category: Dict[_Category, List[CommandDef]] = {}
+
+    def _index_insert(self, key: str, cmd: CommandDef) -> None:
+        i = bisect_left(self._sorted_names, key)
+        self._sorted_names.insert(i, key)
+        self._sorted_cmds.insert(i, cmd)
+
+    def register(self, cmd: CommandDef) -> CommandDef:
+        cmd._compiled_validator = _build_validator(cmd)
+        self.commands[cmd.name] = cmd
+        # Aliases land in one C-level dict.update instead of a Python
+        # loop of assignments.
+        self.commands.update(dict.fromkeys(cmd.aliases, cmd))
+        self._index_insert(cmd.name, cmd)
+        for alias in cmd.aliases:
+            self._index_insert(alias, cmd)
+        if not cmd.hidden:
+            self._visible_insert(cmd)
+        return cmd
+
+    def _visible_insert(self, cmd: CommandDef) -> None:
+        insort(self._visible_sorted, cmd, key=lambda c: (c.category.category_name, c.name))
+        insort(self._visible_by_category.setdefault(cmd.category, []), cmd, key=lambda c: c.name)
+
+    def mark_hidden(self, cmd: CommandDef, hidden: bool = True) -> None:
+        """Rare dynamic-hide path: flip the flag and rebuild the indexes."""
+        cmd.hidden = hidden
+        self._visible_sorted = []
+        self._visible_by_category = {}
+        seen = set()
+        for c in self.commands.values():
+            if id(c) in seen or c.hidden:
+                continue
+            seen.add(id(c))
+            self._visible_insert(c)
+
+    def get(self, name: str) -> Optional[CommandDef]:
+        return self.commands.get(name)
+
+    def list_all(self, include_hidden: bool = False) -> List[CommandDef]:
+        if not include_hidden:
+            return list(self._visible_sorted)
+        # Aliases map to the same CommandDef instance, so identity dedup
+        # is both cheaper (int hashing) and correct even if two distinct
+        # commands were ever to share a name.
+        seen_ids: set = set()
+        result = []
+        for cmd in self.commands.values():
+            if id(cmd) in seen_ids:
+                continue
+            seen_ids.add(id(cmd))
+            result.append(cmd)
+        result.sort(key=lambda c: (c.category.category_name, c.name))
+        return result
+
+    def list_by_category(self, category: _Category) -> List[CommandDef]:
+        return list(self._visible_by_category.get(category, ()))
+
+    def get_command_names(self, prefix: str = "") -> List[str]:
+        """All visible names/aliases starting with ``prefix``, sorted."""
+        lo = bisect_left(self._sorted_names, prefix)
+        hi = bisect_left(self._sorted_names, prefix + "\uffff")
+        cmds = self._sorted_cmds
+        return [name for i, name in enumerate(self._sorted_names[lo:hi], lo) if not cmds[i].hidden]
+
+    # -- documentation -----------------------------------------------------
+
+    def export_api_doc(self, filepath) -> None:
+        """Write the full command/OSC reference as markdown.
+
+        Streams straight to the (buffered) file handle: the document
+        never materializes as a list of lines plus a joined copy.
+        """
+        with open(filepath, "w", buffering=1 << 16) as f:
+            w = f.write
+            w("# ASCII Scope command API\n\n")
+            w("## Quick reference\n\n")
+            w("| Command | Category | OSC address | Args |\n")
+            w("|---------|----------|-------------|------|\n")
+            # One sorted snapshot feeds both the quick-reference table and
+            # the per-category sections; groupby partitions it without a
+            # second sort pass.
+            all_cmds = self.list_all()
+            for cmd in all_cmds:
+                w(
+                    f"| {cmd.name} | {cmd.category.category_name} | "
+                    f"{cmd.get_osc_address()} | {cmd.get_osc_signature() or '-'} |\n"
+                )
+            w("\n")
+            for category, cmds in groupby(all_cmds, key=lambda c: c.category):
+                w(f"## {category.category_name}\n\n")
+                for cmd in cmds:
+                    w(f"### {cmd.name}\n\n")
+                    w(cmd.help or "(no description)")
+                    w("\n\n")
+                    w(f"Usage: `{cmd.format_usage()}`\n\n")
+                    for p in cmd.params:
+                        w(f"- `{p.format_spec()}` — {p.help or p.type.value}\n")
+                    if cmd.params:
+                        w("\n")
+                    # One pass over the params covers both example lines;
+                    # only the missing-default placeholder differs.
+                    defaults = [None if p.default is None else str(p.default) for p in cmd.params]
+                    cli_example = " ".join(d if d is not None else "..." for d in defaults)
+                    osc_example = " ".join(d if d is not None else "0" for d in defaults)
+                    w("```\n# CLI\n" + f"{cmd.name} {cli_example}".rstrip() + "\n")
+                    w("# OSC\n" + f"{cmd.get_osc_address()} {osc_example}".rstrip() + "\n```\n\n")
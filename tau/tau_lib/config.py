@@ -0,0 +1,229 @@
+"""Scope configuration round-trip (TOML on disk).
+
+The on-disk layout is a handful of flat sections — ``kernel``,
+``transport``, ``display``, ``video``, ``files`` — plus ``lanes`` and
+``markers`` arrays.  ``tomli_w`` is used for writing when present; the
+manual writer below covers the common value shapes otherwise.
+"""
+
+import io
+import json
+import mmap
+import os
+import sys
+import tomllib
+from pathlib import Path
+from typing import Optional
+
+try:
+    import tomli_w as toml_writer
+except ImportError:  # pragma: no cover - tomli_w is optional
+    toml_writer = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - msgspec is optional
+    msgspec = None
+
+if msgspec is not None:
+    # Precompiled schema: decode+validate+default-fill happens in
+    # msgspec's C core instead of the hand-written .get ladder below.
+
+    class _KernelSchema(msgspec.Struct, frozen=True):
+        tau_a: float = 0.001
+        tau_r: float = 0.010
+        threshold: float = 0.5
+        refractory: float = 0.002
+        fs: int = 48000
+
+    class _TransportSchema(msgspec.Struct, frozen=True):
+        loop: bool = False
+        speed: float = 1.0
+        position: float = 0.0
+
+    class _DisplaySchema(msgspec.Struct, frozen=True):
+        theme: str = "dark"
+        fps: int = 30
+        show_grid: bool = True
+
+    class _VideoSchema(msgspec.Struct, frozen=True):
+        enabled: bool = False
+        path: str = ""
+
+    class _FilesSchema(msgspec.Struct, frozen=True):
+        context_dir: str = "~/.local/state/tau"
+        last_session: str = ""
+
+    class _ConfigSchema(msgspec.Struct, frozen=True):
+        kernel: _KernelSchema = msgspec.field(default_factory=_KernelSchema)
+        transport: _TransportSchema = msgspec.field(default_factory=_TransportSchema)
+        display: _DisplaySchema = msgspec.field(default_factory=_DisplaySchema)
+        video: _VideoSchema = msgspec.field(default_factory=_VideoSchema)
+        files: _FilesSchema = msgspec.field(default_factory=_FilesSchema)
+        lanes: list = msgspec.field(default_factory=list)
+        markers: list = msgspec.field(default_factory=list)
+
+# Escapes applied to string values in one C-level translate pass; the old
+# f-string interpolation quoted nothing, so a value containing '"' or a
+# newline produced broken TOML.
+_TOML_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+# Section/key schema hoisted to module level: every key string is interned
+# once and both save and load share the same template instead of
+# rebuilding ~30 literal keys per call.
+_SECTION_DEFAULTS = {
+    sys.intern("kernel"): {
+        sys.intern("tau_a"): 0.001,
+        sys.intern("tau_r"): 0.010,
+        sys.intern("threshold"): 0.5,
+        sys.intern("refractory"): 0.002,
+        sys.intern("fs"): 48000,
+    },
+    sys.intern("transport"): {
+        sys.intern("loop"): False,
+        sys.intern("speed"): 1.0,
+        sys.intern("position"): 0.0,
+    },
+    sys.intern("display"): {
+        sys.intern("theme"): "dark",
+        sys.intern("fps"): 30,
+        sys.intern("show_grid"): True,
+    },
+    sys.intern("video"): {
+        sys.intern("enabled"): False,
+        sys.intern("path"): "",
+    },
+    sys.intern("files"): {
+        sys.intern("context_dir"): "~/.local/state/tau",
+        sys.intern("last_session"): "",
+    },
+}
+
+
+# Configs at or above this size are mmap'd in load_config; smaller files
+# (the common case) are cheaper to read() outright.
+_MMAP_THRESHOLD = 64 * 1024
+
+
+# Set once the config directory is known to exist, so repeat path
+# lookups skip the makedirs syscall.
+_config_dir_ready = False
+
+
+def get_default_config_path() -> Path:
+    global _config_dir_ready
+    config_dir = Path("~/.config/tau").expanduser()
+    if not _config_dir_ready:
+        os.makedirs(config_dir, exist_ok=True)
+        _config_dir_ready = True
+    return config_dir / "scope.toml"
+
+
+def _toml_format_value(val) -> str:
+    """Render one TOML value.
+
+    Module-level (rather than a closure inside the writer) so the function
+    object exists once and CPython's per-call-site specialization applies
+    to the recursive list case.
+    """
+    if isinstance(val, bool):
+        return "true" if val else "false"
+    if isinstance(val, str):
+        return f'"{val.translate(_TOML_ESCAPES)}"'
+    if isinstance(val, list):
+        return "[" + ", ".join(_toml_format_value(v) for v in val) + "]"
+    return str(val)
+
+
+def _write_toml_manual(f, config: dict) -> None:
+    """Minimal TOML writer fallback for when tomli_w is unavailable.
+
+    Everything is assembled in a StringIO and handed to the file in one
+    write, so a config full of markers/lanes costs one syscall instead of
+    one per line.
+    """
+    buf = io.StringIO()
+    w = buf.write
+    for section, values in config.items():
+        if isinstance(values, list):
+            for entry in values:
+                w(f"[[{section}]]\n")
+                for k, v in entry.items():
+                    w(f"{k} = {_toml_format_value(v)}\n")
+                w("\n")
+        elif isinstance(values, dict):
+            w(f"[{section}]\n")
+            for k, v in values.items():
+                w(f"{k} = {_toml_format_value(v)}\n")
+            w("\n")
+        else:
+            w(f"{section} = {_toml_format_value(values)}\n")
+    f.write(buf.getvalue())
+
+
+def save_config(config: dict, path: Optional[Path] = None) -> Path:
+    """Write the config dict; returns the path written.
+
+    Without tomli_w the save goes to a .json sidecar via the stdlib C
+    encoder — much faster than the manual TOML writer and guaranteed to
+    round-trip.  _write_toml_manual remains for callers that explicitly
+    want TOML output.
+    """
+    path = Path(path) if path else get_default_config_path()
+    if toml_writer is not None:
+        with open(path, "wb") as f:
+            toml_writer.dump(config, f)
+    else:
+        path = path.with_suffix(".json")
+        with open(path, "w") as f:
+            json.dump(config, f, indent=2, default=str)
+    return path
+
+
+def load_config(path: Optional[Path] = None) -> Optional[dict]:
+    """Read and normalize the config; None when the file does not exist."""
+    path = Path(path) if path else get_default_config_path()
+    # EAFP: one open attempt instead of a stat-then-open pair (and the
+    # TOCTOU window between them).
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        path = path.with_suffix(".json")
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+    with f:
+        # Configs heavy with markers/lanes are mapped instead of read:
+        # msgspec parses zero-copy straight out of the page cache, and
+        # even the copying parsers skip the incremental read() buffering.
+        # Below the threshold a plain read beats the mapping setup.
+        size = os.fstat(f.fileno()).st_size
+        if size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if path.suffix != ".json" and msgspec is not None:
+                    decoded = msgspec.toml.decode(mm, type=_ConfigSchema)
+                    return msgspec.to_builtins(decoded)
+                raw = bytes(mm)
+        else:
+            raw = f.read()
+    if path.suffix == ".json":
+        return _normalize(json.loads(raw))
+    if msgspec is not None:
+        decoded = msgspec.toml.decode(raw, type=_ConfigSchema)
+        return msgspec.to_builtins(decoded)
+    return _normalize(tomllib.loads(raw.decode()))
+
+
+def _normalize(config: dict) -> dict:
+    out = {}
+    for section, defaults in _SECTION_DEFAULTS.items():
+        sec = config.get(section)
+        if not sec:
+            out[section] = defaults.copy()
+        else:
+            out[section] = {k: sec.get(k, v) for k, v in defaults.items()}
+    out["lanes"] = config.get("lanes", [])
+    out["markers"] = config.get("markers", [])
+    return out
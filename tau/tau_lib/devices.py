@@ -0,0 +1,557 @@
+"""Audio device enumeration and selection over the tau-engine socket.
+
+The engine answers ``DEVICES`` with one line per device::
+
+    CAPTURE <index> <is_default> <is_current> <name>
+    PLAYBACK <index> <is_default> <is_current> <name>
+
+and ``DEVICE <type> <index>`` switches the active device.  On top of that
+this module keeps per-user state under ``~/.config/tau``: device aliases
+(``devices.toml``), per-app overrides (``apps/<app>.toml``), and saved
+device profiles (``profiles/<name>.toml``).
+"""
+
+import copy
+import os
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+import tomllib
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tomli_w as toml_writer
+except ImportError:  # pragma: no cover - tomli_w is optional
+    toml_writer = None
+
+ENGINE_SOCKET = "/tmp/tau-engine.sock"
+CONFIG_DIR = Path("~/.config/tau").expanduser()
+DEVICES_TOML = CONFIG_DIR / "devices.toml"
+APPS_DIR = CONFIG_DIR / "apps"
+PROFILES_DIR = CONFIG_DIR / "profiles"
+
+# One alternation extracts every device field in a single C-level scan of
+# the whole response; no per-line startswith/split in Python.  Matching
+# in bytes avoids decoding the full recv buffer — only device names are
+# decoded, on extraction.
+_DEVICE_RE = re.compile(rb"^(CAPTURE|PLAYBACK) (\d+) ([01]) ([01]) (.+)$", re.MULTILINE)
+
+# Engine acknowledgements, keyed off the first token.  partition + one
+# frozenset probe replaces per-variant startswith chains in the select
+# paths and stays O(1) as acknowledgement forms grow.
+_OK_TAGS = frozenset((b"OK", b"DONE"))
+
+
+def _is_ok(response: bytes) -> bool:
+    return response.partition(b" ")[0].rstrip() in _OK_TAGS
+
+
+def _deep_merge(base: dict, update: dict) -> dict:
+    """Merge ``update`` into a copy of ``base``, nesting through dicts.
+
+    Iterative with an explicit worklist: no per-call closure allocation
+    and no Python frame per nesting level.
+    """
+    merged = copy.deepcopy(base)
+    work = deque([(merged, update)])
+    while work:
+        dst, src = work.popleft()
+        for k, v in src.items():
+            existing = dst.get(k)
+            if isinstance(v, dict) and isinstance(existing, dict):
+                work.append((existing, v))
+            else:
+                dst[k] = v
+    return merged
+
+
+def _toml_value(v) -> str:
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if isinstance(v, str):
+        return f'"{v}"'
+    return str(v)
+
+
+def _dump_toml_manual(data: dict, path: Path) -> None:
+    """Generic nested-dict TOML writer for when tomli_w is absent.
+
+    The document is assembled in one parts list and written with a
+    single write_text call — one locked write and one syscall instead
+    of one per line.
+    """
+    parts: List[str] = []
+    append = parts.append
+
+    def write_table(table: dict, prefix: str) -> None:
+        subtables = []
+        for k, v in table.items():
+            if isinstance(v, dict):
+                subtables.append((k, v))
+            else:
+                append(f"{k} = {_toml_value(v)}\n")
+        for k, v in subtables:
+            name = f"{prefix}.{k}" if prefix else k
+            append(f"\n[{name}]\n")
+            write_table(v, name)
+
+    write_table(data, "")
+    path.write_text("".join(parts))
+
+
+# Writer selected once at import: the three save paths below all call
+# _toml_dump rather than re-checking for tomli_w and duplicating a
+# hand-rolled serializer each.
+if toml_writer is not None:
+    def _toml_dump(data: dict, path: Path) -> None:
+        with open(path, "wb") as f:
+            toml_writer.dump(data, f)
+else:
+    _toml_dump = _dump_toml_manual
+
+
+@dataclass(slots=True, frozen=True)
+class AudioDevice:
+    """One capture or playback endpoint as reported by the engine.
+
+    frozen+slots: one of these is allocated per device per enumeration
+    and read in tight resolve loops, so the fixed layout saves the
+    per-instance __dict__ and speeds attribute access; immutability lets
+    the index maps share instances safely.
+    """
+
+    device_type: str  # "capture" | "playback"
+    index: int
+    is_default: bool
+    is_current: bool
+    name: str
+    # Lowercased once at parse time so resolve loops never re-call
+    # .lower() per device per lookup.
+    _name_lower: str = field(init=False, repr=False)
+    # Display form, rendered lazily on first print; safe to keep forever
+    # because the instance is frozen.
+    _str_cache: Optional[str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_name_lower", self.name.lower())
+        object.__setattr__(self, "_str_cache", None)
+
+    def __str__(self) -> str:
+        cached = self._str_cache
+        if cached is None:
+            markers = []
+            if self.is_current:
+                markers.append("*")
+            if self.is_default:
+                markers.append("default")
+            suffix = f" [{', '.join(markers)}]" if markers else ""
+            cached = f"{self.index}: {self.name}{suffix}"
+            object.__setattr__(self, "_str_cache", cached)
+        return cached
+
+
+class TetraDevices:
+    """Client for the engine's device protocol plus local device config."""
+
+    def __init__(self, socket_path: str = ENGINE_SOCKET, cache_ttl: float = 2.0):
+        self.socket_path = socket_path
+        self._client: Optional[socket.socket] = None
+        self._client_path: Optional[str] = None
+        self._stream: Optional[socket.socket] = None
+        self._stream_unsupported = False
+        self._lock = threading.Lock()
+        # Device enumeration rarely changes within a process lifetime;
+        # consecutive resolve/select calls reuse the last DEVICES reply
+        # for cache_ttl seconds instead of re-querying the engine.
+        self._cache_ttl = cache_ttl
+        self._device_cache: Optional[Tuple[List[AudioDevice], List[AudioDevice]]] = None
+        self._device_cache_ts = 0.0
+        self._index_maps: Dict[str, dict] = {}
+        # Parsed-TOML memo keyed (mtime_ns, size): repeat reads of the
+        # same unchanged file are a stat plus a dict lookup.
+        self._toml_cache: Dict[Path, Tuple[int, int, dict]] = {}
+        self._aliases: Dict[str, Dict[str, str]] = self._load_device_aliases()
+
+    # -- IPC ---------------------------------------------------------------
+
+    def _ensure_client(self) -> socket.socket:
+        """Bind the reply socket once and reuse it for every command.
+
+        On Linux the client binds an abstract-namespace address (leading
+        NUL byte), so no filesystem entry exists and no unlink is ever
+        needed; elsewhere a /tmp path unique to this instance is used.
+        The per-call socket()/bind()/close()/unlink() sequence this
+        replaces cost four syscalls per command.
+        """
+        if self._client is None:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            if sys.platform == "linux":
+                client.bind(b"\0tau-devices-%d-%d" % (os.getpid(), id(self)))
+            else:
+                # Prefer the per-user runtime dir (tmpfs-backed, few
+                # dentries) over /tmp; pid+id makes the name unique so
+                # no pre-bind unlink is needed.
+                run_dir = os.environ.get("XDG_RUNTIME_DIR", "/tmp")
+                path = f"{run_dir}/tau-devices-{os.getpid()}-{id(self)}.sock"
+                client.bind(path)
+                self._client_path = path
+            client.settimeout(1.0)
+            self._client = client
+        return self._client
+
+    def _ensure_stream(self) -> Optional[socket.socket]:
+        """Connect a SOCK_SEQPACKET session to the engine if it offers one.
+
+        A connected stream needs no client-side address at all, so the
+        datagram reply socket (and its bind) is skipped entirely.  Engines
+        built without stream support refuse the connect once; after that
+        every command goes straight to the datagram fallback.
+        """
+        if self._stream is None and not self._stream_unsupported:
+            try:
+                stream = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+                stream.connect(self.socket_path)
+                stream.settimeout(1.0)
+                self._stream = stream
+            except OSError:
+                self._stream_unsupported = True
+        return self._stream
+
+    @staticmethod
+    def _recv_frame(stream: socket.socket) -> bytes:
+        """Read one length-prefixed response frame.
+
+        The first recv asks for a whole buffer rather than just the
+        4-byte header: SEQPACKET truncates a packet to the requested
+        size, so header and body must come off the wire together.
+        """
+        data = stream.recv(1 << 16)
+        if len(data) < 4:
+            raise ConnectionError("tau-engine closed the stream")
+        (n,) = struct.unpack(">I", data[:4])
+        data = data[4:]
+        while len(data) < n:
+            chunk = stream.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("tau-engine closed the stream")
+            data += chunk
+        return data
+
+    def _send_command(self, command: str) -> bytes:
+        """Send one command; the raw response bytes come back undecoded.
+
+        Parsers work directly on the bytes (the device regex matches in
+        bytes and decodes only names), so the full recv buffer is never
+        UTF-8 decoded wholesale.
+        """
+        with self._lock:
+            stream = self._ensure_stream()
+            if stream is not None:
+                try:
+                    payload = command.encode()
+                    # 4-byte big-endian length framing keeps command and
+                    # response boundaries explicit so multiple frames can
+                    # share one write later.
+                    stream.sendall(struct.pack(">I", len(payload)) + payload)
+                    return self._recv_frame(stream)
+                except OSError:
+                    stream.close()
+                    self._stream = None
+                    self._stream_unsupported = True
+            client = self._ensure_client()
+            try:
+                client.sendto(command.encode(), self.socket_path)
+                data, _ = client.recvfrom(16384)
+                return data
+            except socket.timeout:
+                raise RuntimeError(f"tau-engine did not respond at {self.socket_path}")
+
+    def _send_commands(self, commands: List[str]) -> List[bytes]:
+        """Pipeline several commands: one write, then matching replies.
+
+        Over the stream session every frame shares a single sendall and
+        the replies are read back in order; on the datagram fallback the
+        commands simply go out one at a time.
+        """
+        with self._lock:
+            stream = self._ensure_stream()
+            if stream is not None:
+                try:
+                    frames = b"".join(
+                        struct.pack(">I", len(payload)) + payload
+                        for payload in (c.encode() for c in commands)
+                    )
+                    stream.sendall(frames)
+                    return [self._recv_frame(stream) for _ in commands]
+                except OSError:
+                    stream.close()
+                    self._stream = None
+                    self._stream_unsupported = True
+        return [self._send_command(c) for c in commands]
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            if self._client_path is not None:
+                try:
+                    os.unlink(self._client_path)
+                except OSError:
+                    pass
+                self._client_path = None
+
+    def __enter__(self) -> "TetraDevices":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # -- enumeration -------------------------------------------------------
+
+    def _parse_devices_response(self, response: bytes) -> Tuple[List[AudioDevice], List[AudioDevice]]:
+        capture_devices: List[AudioDevice] = []
+        playback_devices: List[AudioDevice] = []
+        for m in _DEVICE_RE.finditer(response):
+            kind, index, default, current, name = m.groups()
+            dev = AudioDevice(
+                "capture" if kind == b"CAPTURE" else "playback",
+                int(index),
+                default == b"1",
+                current == b"1",
+                name.decode("utf-8", "replace"),
+            )
+            (capture_devices if kind == b"CAPTURE" else playback_devices).append(dev)
+        return capture_devices, playback_devices
+
+    def list_devices(self) -> Tuple[List[AudioDevice], List[AudioDevice]]:
+        """All (capture, playback) devices the engine can see."""
+        if self._device_cache is not None and time.monotonic() - self._device_cache_ts < self._cache_ttl:
+            return self._device_cache
+        response = self._send_command("DEVICES")
+        self._device_cache = self._parse_devices_response(response)
+        self._device_cache_ts = time.monotonic()
+        self._build_index_maps()
+        return self._device_cache
+
+    def _build_index_maps(self) -> None:
+        """O(1) lookup tiers for resolve_device, rebuilt per enumeration."""
+        self._index_maps = {}
+        for kind, devices in zip(("capture", "playback"), self._device_cache):
+            self._index_maps[kind] = {
+                "by_index": {dev.index: dev for dev in devices},
+                "by_name_lower": {dev._name_lower: dev for dev in devices},
+                "default": next((dev for dev in devices if dev.is_default), None),
+            }
+
+    def invalidate_device_cache(self) -> None:
+        self._device_cache = None
+
+    def list_capture_devices(self) -> List[AudioDevice]:
+        return self.list_devices()[0]
+
+    def list_playback_devices(self) -> List[AudioDevice]:
+        return self.list_devices()[1]
+
+    # -- resolution / selection -------------------------------------------
+
+    def resolve_device(self, identifier: str, device_type: str = "capture") -> Optional[AudioDevice]:
+        """Map an alias, index, "default", or name fragment to a device."""
+        if not identifier:
+            # An empty pattern substring-matches every name, which would
+            # silently resolve to whichever device the map yields first.
+            return None
+        aliases = self._aliases.get(device_type)
+        if aliases:
+            target = aliases.get(identifier)
+            if target is None and not identifier.islower():
+                target = aliases.get(identifier.lower())
+            if target is not None:
+                identifier = target
+
+        self.list_devices()  # refresh cache and index maps if stale
+        maps = self._index_maps.get(device_type)
+        if maps is None:
+            return None
+
+        # Ordered for the common already-canonical cases: a numeric
+        # selector is rejected or accepted off its first character
+        # (cheaper than .isdigit() on a long name), and "default" is an
+        # exact compare with no per-call lowering.
+        if identifier[:1] in "0123456789":
+            if identifier.isdigit():
+                return maps["by_index"].get(int(identifier))
+        elif identifier == "default":
+            return maps["default"]
+        pattern = identifier.lower()
+        exact = maps["by_name_lower"].get(pattern)
+        if exact is not None:
+            return exact
+        # Substring fallback only when the O(1) tiers all miss.
+        for name_lower, dev in maps["by_name_lower"].items():
+            if pattern in name_lower:
+                return dev
+        return None
+
+    def select_device(self, identifier: str, device_type: str = "capture") -> bool:
+        # resolve_device reuses the TTL device cache, so a select right
+        # after a listing costs a single DEVICE round-trip.
+        dev = self.resolve_device(identifier, device_type)
+        if dev is None:
+            return False
+        response = self._send_command(f"DEVICE {device_type} {dev.index}")
+        if _is_ok(response):
+            # The is_current flags in the cached listing are now stale.
+            self._device_cache = None
+            return True
+        return False
+
+    def select_both(self, capture_id: str, playback_id: str) -> bool:
+        """Select capture and playback together, pipelined in one write."""
+        capture = self.resolve_device(capture_id, "capture")
+        playback = self.resolve_device(playback_id, "playback")
+        if capture is None or playback is None:
+            return False
+        responses = self._send_commands(
+            [f"DEVICE capture {capture.index}", f"DEVICE playback {playback.index}"]
+        )
+        if all(map(_is_ok, responses)):
+            self._device_cache = None
+            return True
+        return False
+
+    # -- local TOML state --------------------------------------------------
+
+    def _load_toml(self, path: Path) -> Optional[dict]:
+        """Parse ``path`` with an mtime/size-keyed cache.
+
+        Returns a deep copy so callers can mutate their view without
+        poisoning the cache; None when the file does not exist.
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        cached = self._toml_cache.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return copy.deepcopy(cached[2])
+        # read_bytes pulls the (small) file in one read syscall, skipping
+        # the buffered-reader layer tomllib.load would go through.
+        data = tomllib.loads(Path(path).read_bytes().decode("utf-8"))
+        self._toml_cache[path] = (st.st_mtime_ns, st.st_size, data)
+        return copy.deepcopy(data)
+
+    # -- aliases -----------------------------------------------------------
+
+    def _load_device_aliases(self) -> Dict[str, Dict[str, str]]:
+        # Module-level memo: every fresh TetraDevices (the convenience
+        # wrappers used to make one per call) shares the parsed aliases
+        # until the file's mtime changes.
+        global _aliases_cache
+        try:
+            mtime = os.stat(DEVICES_TOML).st_mtime_ns
+        except FileNotFoundError:
+            return {"capture": {}, "playback": {}}
+        if _aliases_cache is not None and _aliases_cache[0] == mtime:
+            return copy.deepcopy(_aliases_cache[1])
+        data = self._load_toml(DEVICES_TOML) or {}
+        # Keys are lowered once here so alias lookups are
+        # case-insensitive without allocating a lowered copy per call.
+        aliases = {
+            "capture": {k.lower(): v for k, v in data.get("capture", {}).items()},
+            "playback": {k.lower(): v for k, v in data.get("playback", {}).items()},
+        }
+        _aliases_cache = (mtime, copy.deepcopy(aliases))
+        return aliases
+
+    def _save_device_aliases(self) -> None:
+        global _aliases_cache
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        _toml_dump(self._aliases, DEVICES_TOML)
+        self._toml_cache.pop(DEVICES_TOML, None)
+        _aliases_cache = None
+
+    def set_alias(self, alias: str, target: str, device_type: str = "capture") -> None:
+        self._aliases.setdefault(device_type, {})[alias.lower()] = target
+        self._save_device_aliases()
+
+    # -- per-app config ----------------------------------------------------
+
+    def get_app_config(self, app: str) -> Optional[dict]:
+        return self._load_toml(APPS_DIR / f"{app}.toml")
+
+    def set_app_config(self, app: str, config: dict) -> None:
+        os.makedirs(APPS_DIR, exist_ok=True)
+        existing = self.get_app_config(app) or {}
+        merged = _deep_merge(existing, config)
+        path = APPS_DIR / f"{app}.toml"
+        _toml_dump(merged, path)
+        self._toml_cache.pop(path, None)
+
+    def list_apps(self) -> List[str]:
+        return _list_toml_stems(APPS_DIR)
+
+    # -- profiles ----------------------------------------------------------
+
+    def get_profile(self, name: str) -> Optional[dict]:
+        return self._load_toml(PROFILES_DIR / f"{name}.toml")
+
+    def save_profile(self, name: str, profile: dict) -> None:
+        os.makedirs(PROFILES_DIR, exist_ok=True)
+        path = PROFILES_DIR / f"{name}.toml"
+        _toml_dump(profile, path)
+        self._toml_cache.pop(path, None)
+
+    def list_profiles(self) -> List[str]:
+        return _list_toml_stems(PROFILES_DIR)
+
+
+def _list_toml_stems(directory: Path) -> List[str]:
+    """Sorted stems of the *.toml files in ``directory``.
+
+    scandir keeps the walk in C and its DirEntry type check avoids a
+    stat per file, unlike Path.glob + .stem.
+    """
+    if not os.path.isdir(directory):
+        return []
+    with os.scandir(directory) as it:
+        return sorted(
+            e.name[:-5] for e in it if e.name.endswith(".toml") and e.is_file(follow_symlinks=False)
+        )
+
+
+# -- convenience wrappers --------------------------------------------------
+
+# Parsed devices.toml shared across instances, keyed by mtime_ns.
+_aliases_cache: Optional[Tuple[int, Dict[str, Dict[str, str]]]] = None
+
+# Lazily-built shared instance so the convenience functions stop paying
+# a socket bind and alias load per call.
+_default_instance: Optional[TetraDevices] = None
+
+
+def _default() -> TetraDevices:
+    global _default_instance
+    if _default_instance is None:
+        _default_instance = TetraDevices()
+    return _default_instance
+
+
+def list_devices() -> Tuple[List[AudioDevice], List[AudioDevice]]:
+    return _default().list_devices()
+
+
+def resolve_capture(identifier: str) -> Optional[AudioDevice]:
+    return _default().resolve_device(identifier, "capture")
+
+
+def resolve_playback(identifier: str) -> Optional[AudioDevice]:
+    return _default().resolve_device(identifier, "playback")
@@ -0,0 +1,45 @@
+"""Lane layout for the scope display.
+
+A lane is one horizontal strip of the terminal given to a channel (or a
+derived view of one); the manager owns ordering and height bookkeeping.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class Lane:
+    """One display strip bound to a source channel."""
+
+    channel_id: int
+    height: int = 8
+    label: str = ""
+    collapsed: bool = False
+
+
+class LaneManager:
+    """Ordered collection of lanes, one per visible channel by default."""
+
+    def __init__(self, num_channels: int = 4):
+        self.lanes: List[Lane] = [Lane(i, label=f"ch{i}") for i in range(num_channels)]
+
+    def get(self, index: int) -> Optional[Lane]:
+        if 0 <= index < len(self.lanes):
+            return self.lanes[index]
+        return None
+
+    def move(self, index: int, delta: int) -> bool:
+        target = index + delta
+        if not (0 <= index < len(self.lanes) and 0 <= target < len(self.lanes)):
+            return False
+        self.lanes[index], self.lanes[target] = self.lanes[target], self.lanes[index]
+        return True
+
+    def toggle_collapsed(self, index: int) -> None:
+        lane = self.get(index)
+        if lane is not None:
+            lane.collapsed = not lane.collapsed
+
+    def total_height(self) -> int:
+        return sum(1 if lane.collapsed else lane.height for lane in self.lanes)
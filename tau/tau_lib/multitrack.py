@@ -0,0 +1,302 @@
+"""Multitrack sample control and offline tscale runs.
+
+:class:`TauMultitrack` drives the engine's sample slots — load, trigger,
+stop, seek, and gain — over the same ``/tmp/tau-engine.sock`` datagram
+protocol the device layer uses.  :class:`TscaleRunner` shells out to the
+tscale binary for offline pulse extraction and keeps a small TRS index of
+generated TSV files so repeat runs are found instead of recomputed.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tau_lib.devices import ENGINE_SOCKET
+
+try:
+    from inotify_simple import INotify, flags as _inotify_flags
+except ImportError:  # pragma: no cover - inotify_simple is optional
+    INotify = None
+
+# Pre-encoded fragments for the gain setters, the hottest commands
+# under live mixer automation: the wire bytes are assembled with bytes
+# interpolation and join, never touching str formatting or encode().
+_SAMPLE_B = b"SAMPLE "
+_CHANNEL_B = b"CHANNEL "
+_GAIN_B = b" GAIN "
+_MASTER_GAIN_B = b"MASTER GAIN "
+
+# Engine binary location, resolved once at import: the candidate set is
+# fixed, so per-instance stat probes in _start_engine buy nothing.
+_ENGINE_BINARY: Optional[Path] = next(
+    (
+        p
+        for p in (
+            Path(__file__).resolve().parent / "engine" / "tau-engine",
+            Path("~/tau/engine/tau-engine").expanduser(),
+        )
+        if p.exists()
+    ),
+    None,
+)
+
+
+def _dumps_toml(data: dict) -> str:
+    """Render a dict of flat sections as TOML text."""
+    parts = []
+    for section, values in data.items():
+        parts.append(f"[{section}]\n")
+        for k, v in values.items():
+            if isinstance(v, bool):
+                v = "true" if v else "false"
+            elif isinstance(v, str):
+                v = f'"{v}"'
+            parts.append(f"{k} = {v}\n")
+        parts.append("\n")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def _resolve(p: str) -> Path:
+    """Expand and resolve a path, memoized.
+
+    resolve() walks every component with lstat; batch runs hit the same
+    files and directories over and over, so the syscalls happen once per
+    distinct path string.
+    """
+    return Path(p).expanduser().resolve()
+
+
+@lru_cache(maxsize=128)
+def _kernel_toml(items: tuple) -> str:
+    """TOML text for one kernel-parameter set, memoized by value.
+
+    Batch runs sweep many audio files with the same handful of kernel
+    settings; the dict iteration and string formatting happen once per
+    distinct set, the rest are lookups.
+    """
+    return _dumps_toml({"kernel": dict(items)})
+
+
+class TauMultitrack:
+    """Client for the engine's multitrack sample slots."""
+
+    def __init__(self, socket_path: str = ENGINE_SOCKET):
+        self.socket_path = Path(socket_path)
+        self.loaded_tracks: Dict[int, Path] = {}
+        self._engine_proc: Optional[subprocess.Popen] = None
+        # One client socket for the life of the instance: the per-call
+        # socket/bind/close/unlink churn is paid once here, and a lock
+        # serializes concurrent senders over the shared reply path.
+        # Same addressing as TetraDevices._ensure_client: on Linux an
+        # abstract-namespace name (pid+id, so instances never collide
+        # and nothing is ever left on disk); elsewhere a /tmp path with
+        # a stale-file unlink before bind.
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        if sys.platform == "linux":
+            self._sock.bind(b"\0tau-multitrack-%d-%d" % (os.getpid(), id(self)))
+            self._sock_path = None
+        else:
+            path = f"/tmp/tau-client-{os.getpid()}-{id(self)}.sock"
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            self._sock.bind(path)
+            self._sock_path = path
+        self._sock.settimeout(1.0)
+        self._lock = threading.Lock()
+        # connect() once (lazily, since the engine may not be up yet at
+        # construction): send()/recv() thereafter, so the kernel skips
+        # the destination path lookup on every datagram.
+        self._connected = False
+
+    def _send_command(self, command: str) -> str:
+        return self._send_raw(command.encode())
+
+    def _send_raw(self, data: bytes) -> str:
+        with self._lock:
+            try:
+                if not self._connected:
+                    self._sock.connect(str(self.socket_path))
+                    self._connected = True
+                self._sock.send(data)
+                response = self._sock.recv(4096)
+            except OSError:
+                # Engine restart replaces the socket inode; reconnect on
+                # the next call.
+                self._connected = False
+                raise
+        return response.decode().strip()
+
+    def _start_engine(self) -> bool:
+        """Launch tau-engine if its socket is not up; True when reachable."""
+        if self.socket_path.exists():
+            return True
+        if _ENGINE_BINARY is None:
+            return False
+        self._engine_proc = subprocess.Popen(
+            [str(_ENGINE_BINARY)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return self._wait_for_socket(2.0)
+
+    def _wait_for_socket(self, timeout: float) -> bool:
+        """Block until the engine socket appears, up to ``timeout`` seconds.
+
+        Event-driven via inotify when available — the wait ends the
+        moment the socket is created rather than at the next 100ms poll
+        tick.  Falls back to the sleep loop without inotify_simple.
+        """
+        if INotify is not None:
+            inot = INotify()
+            try:
+                inot.add_watch(str(self.socket_path.parent), _inotify_flags.CREATE)
+                if self.socket_path.exists():  # appeared before the watch
+                    return True
+                deadline = time.monotonic() + timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    for event in inot.read(timeout=int(remaining * 1000)):
+                        if event.name == self.socket_path.name:
+                            return True
+            finally:
+                inot.close()
+        for _ in range(max(1, round(timeout / 0.1))):
+            if self.socket_path.exists():
+                return True
+            time.sleep(0.1)
+        return False
+
+    def _cleanup_engine(self) -> None:
+        if self._engine_proc is not None:
+            self._engine_proc.terminate()
+            self._engine_proc = None
+        self._sock.close()
+        if self._sock_path is not None:
+            try:
+                os.unlink(self._sock_path)
+            except FileNotFoundError:
+                pass
+
+    def load_track(self, track_id: int, audio_path) -> bool:
+        path = _resolve(str(audio_path))
+        response = self._send_command(f"SAMPLE {track_id} LOAD {path}")
+        if response.startswith("OK"):
+            self.loaded_tracks[track_id] = path
+            return True
+        return False
+
+    # Bulk operations ride in one newline-separated datagram; the engine
+    # splits on '\n' and executes each line, replying once.  One IPC
+    # round-trip for N tracks instead of N.
+
+    def play_all(self) -> None:
+        if self.loaded_tracks:
+            self._send_command("\n".join(f"SAMPLE {tid} TRIG" for tid in self.loaded_tracks))
+
+    def stop_all(self) -> None:
+        if self.loaded_tracks:
+            self._send_command("\n".join(f"SAMPLE {tid} STOP" for tid in self.loaded_tracks))
+
+    def seek_all(self, position: float) -> None:
+        if self.loaded_tracks:
+            self._send_command(
+                "\n".join(f"SAMPLE {tid} SEEK {position:.6f}" for tid in self.loaded_tracks)
+            )
+
+    def set_track_gain(self, track_id: int, gain: float) -> None:
+        self._send_raw(b"".join((_SAMPLE_B, b"%d" % track_id, _GAIN_B, b"%.3f" % gain)))
+
+    def set_channel_gain(self, channel: int, gain: float) -> None:
+        self._send_raw(b"".join((_CHANNEL_B, b"%d" % channel, _GAIN_B, b"%.3f" % gain)))
+
+    def set_master_gain(self, gain: float) -> None:
+        self._send_raw(_MASTER_GAIN_B + b"%.3f" % gain)
+
+
+@dataclass(slots=True)
+class TRSRecord:
+    """One entry in the generated-data index."""
+
+    filepath: Path
+    type: str = "data"
+    kind: str = "raw"
+    format: str = "tsv"
+
+
+class TRSIndex:
+    """Flat index of generated files under one directory."""
+
+    def __init__(self, root):
+        self.root = Path(root).expanduser()
+
+    def query(self, type: str = "data", kind: str = "raw", format: str = "tsv") -> List[TRSRecord]:
+        if not self.root.is_dir():
+            return []
+        suffix = f".{format}"
+        return [
+            TRSRecord(Path(entry.path), type, kind, format)
+            for entry in os.scandir(self.root)
+            if entry.name.endswith(suffix)
+        ]
+
+
+class TscaleRunner:
+    """Offline tscale runs plus lookup of previously generated output."""
+
+    # How long one TRS query result is reused before re-reading the index.
+    _QUERY_TTL = 1.0
+
+    def __init__(self, binary: str = "tscale", data_dir: str = "~/.local/state/tau/data"):
+        self.binary = binary
+        self.data_dir = Path(data_dir).expanduser()
+        self.trs = TRSIndex(self.data_dir)
+        # (monotonic timestamp, audio_stem -> newest output path); a batch
+        # over N files shares one index read and resolves each stem with
+        # a dict lookup instead of scanning every record.
+        self._query_cache: Optional[tuple] = None
+
+    def _stem_map(self) -> Dict[str, Path]:
+        now = time.monotonic()
+        cached = self._query_cache
+        if cached is not None and now - cached[0] < self._QUERY_TTL:
+            return cached[1]
+        records = self.trs.query(type="data", kind="raw", format="tsv")
+        records.sort(key=lambda r: r.filepath.stat().st_mtime, reverse=True)
+        stem_map: Dict[str, Path] = {}
+        for record in records:  # newest first; setdefault keeps it
+            stem_map.setdefault(record.filepath.name.split(".")[0], record.filepath)
+        self._query_cache = (now, stem_map)
+        return stem_map
+
+    def run(self, audio_file, kernel: dict) -> Path:
+        """Run tscale over ``audio_file``; returns the output TSV path."""
+        audio_path = _resolve(str(audio_file))
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        config_path = self.data_dir / f"{audio_path.stem}.kernel.toml"
+        config_path.write_text(_kernel_toml(tuple(sorted(kernel.items()))))
+        output_path = self.data_dir / f"{audio_path.stem}.tsv"
+        subprocess.run(
+            [self.binary, "-c", str(config_path), "-o", str(output_path), str(audio_path)],
+            check=True,
+        )
+        self._query_cache = None  # the index just gained a file
+        return output_path
+
+    def find_or_generate(self, audio_file, kernel: dict) -> Path:
+        """Return existing tscale output for ``audio_file``, running it if absent."""
+        existing = self._stem_map().get(Path(audio_file).stem)
+        if existing is not None:
+            return existing
+        return self.run(audio_file, kernel)
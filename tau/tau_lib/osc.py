@@ -0,0 +1,403 @@
+"""OSC bridge: inbound command dispatch and outbound state broadcast.
+
+Addresses mirror the command registry (``/snn/<category>/<name>``); state
+broadcasts go out under ``/snn/state/``.  python-osc is optional — with
+it absent every entry point degrades to a no-op so the TUI runs
+unaffected.
+"""
+
+import io
+import queue
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    from pythonosc import udp_client
+    from pythonosc.dispatcher import Dispatcher
+    from pythonosc.osc_server import ThreadingOSCUDPServer
+
+    OSC_AVAILABLE = True
+except ImportError:  # pragma: no cover - pythonosc is optional
+    OSC_AVAILABLE = False
+
+DEFAULT_SEND_PORT = 57120
+DEFAULT_RECV_PORT = 57121
+
+# Characters that make an OSC address a pattern rather than a literal.
+_OSC_PATTERN_CHARS = frozenset("*?[]{}")
+
+
+def _bundle_element_template(address: str, typetag: bytes) -> bytes:
+    """Serialize everything fixed about a one-argument OSC message.
+
+    For the state broadcasts the address and type tag never change, so
+    the size prefix, padded address, and padded tag string are baked
+    into one bytes object; per send only the 4-byte payload is packed
+    and appended.
+    """
+    raw = address.encode("ascii")
+    header = raw + b"\x00" * (4 - len(raw) % 4) + b"," + typetag + b"\x00\x00"
+    return struct.pack(">I", len(header) + 4) + header
+
+if OSC_AVAILABLE:
+
+    class _ExactDispatcher(Dispatcher):
+        """Dispatcher with an O(1) fast path for literal addresses.
+
+        python-osc matches every inbound address against each mapped
+        pattern in turn; with one mapping per command that is a linear
+        regex scan per packet.  Literal mappings (no ``*?[]{}``) are
+        indexed in a plain dict as well, so the common case — a
+        controller sending exact command addresses — is one dict lookup.
+        Pattern mappings, and inbound addresses that are themselves
+        patterns, still take the stock matcher.  A literal hit returns
+        only its own handlers, so avoid overlapping a literal mapping
+        with a pattern mapping for the same address.
+        """
+
+        def __init__(self):
+            super().__init__()
+            self._exact: Dict[str, list] = {}
+
+        def map(self, address, handler, *args, **kwargs):
+            mapped = super().map(address, handler, *args, **kwargs)
+            if _OSC_PATTERN_CHARS.isdisjoint(address):
+                self._exact.setdefault(address, []).append(mapped)
+            return mapped
+
+        def unmap(self, address, handler, *args, **kwargs):
+            super().unmap(address, handler, *args, **kwargs)
+            self._exact.pop(address, None)
+
+        def handlers_for_address(self, dotted_address):
+            exact = self._exact.get(dotted_address)
+            if exact is not None:
+                return iter(exact)
+            return super().handlers_for_address(dotted_address)
+
+
+class OSCClient:
+    """Socket-level wrapper: one outbound client, one inbound server."""
+
+    def __init__(self, host: str = "127.0.0.1", send_port: int = DEFAULT_SEND_PORT,
+                 recv_port: int = DEFAULT_RECV_PORT):
+        self.host = host
+        self.send_port = send_port
+        self.recv_port = recv_port
+        self.enabled = False
+        self.server = None
+        self.server_thread = None
+        self._server_stop = threading.Event()
+        # Built on first use (same pattern as Transport._ensure_tau): a
+        # run with OSC disabled never allocates the UDP socket or the
+        # dispatcher's pattern tables.
+        self.client = None
+        self.dispatcher = None
+        # True once enable()'s probe send succeeds; send() trusts it
+        # rather than re-checking per call.
+        self._send_ok = False
+        # path -> full /snn/state/ address, filled on first use so the
+        # per-tick broadcasts never re-run the f-string.
+        self._state_addr_cache: Dict[str, str] = {}
+
+    def _ensure_client(self):
+        if self.client is None and OSC_AVAILABLE:
+            self.client = udp_client.SimpleUDPClient(self.host, self.send_port)
+        return self.client
+
+    def _ensure_dispatcher(self):
+        if self.dispatcher is None and OSC_AVAILABLE:
+            self.dispatcher = _ExactDispatcher()
+        return self.dispatcher
+
+    def enable(self) -> bool:
+        if not OSC_AVAILABLE:
+            return False
+        # Probe once here so the per-tick send() path carries no
+        # try/except: UDP sends only fail for persistent reasons
+        # (unroutable host, closed socket), all caught at enable time or
+        # by the periodic-update layer flipping _send_ok back off.
+        try:
+            self._ensure_client().send_message("/snn/state/ping", 1)
+            self._send_ok = True
+        except OSError:
+            self._send_ok = False
+        self.enabled = True
+        return True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self._send_ok = False
+        self.stop_server()
+
+    def send(self, address: str, value) -> None:
+        if not self._send_ok:
+            return
+        self.client.send_message(address, value)
+
+    def send_state_update(self, path: str, value) -> None:
+        cache = self._state_addr_cache
+        address = cache.get(path)
+        if address is None:
+            address = cache[path] = f"/snn/state/{path}"
+        self.send(address, value)
+
+    def register_handler(self, address: str, handler) -> None:
+        dispatcher = self._ensure_dispatcher()
+        if dispatcher is not None:
+            dispatcher.map(address, handler)
+
+    def _ensure_server(self):
+        # Bound once and kept across enable/disable cycles: toggling OSC
+        # (config reload, remote connect) restarts only the dispatch
+        # thread, never rebinds the recv port.
+        if self.server is None and OSC_AVAILABLE:
+            self.server = ThreadingOSCUDPServer((self.host, self.recv_port), self._ensure_dispatcher())
+            self.server.timeout = 0.2
+        return self.server
+
+    def _serve(self) -> None:
+        # handle_request honours server.timeout, so the loop notices the
+        # stop event within one timeout period.
+        while not self._server_stop.is_set():
+            self.server.handle_request()
+
+    def start_server(self) -> bool:
+        if not OSC_AVAILABLE or not self.enabled:
+            return False
+        if self.server_thread is not None:
+            return True
+        if self._ensure_server() is None:
+            return False
+        self._server_stop.clear()
+        self.server_thread = threading.Thread(target=self._serve, daemon=True)
+        self.server_thread.start()
+        return True
+
+    def stop_server(self) -> None:
+        if self.server_thread is None:
+            return
+        self._server_stop.set()
+        self.server_thread.join()
+        self.server_thread = None
+
+
+class _AsyncSender:
+    """Background datagram writer with a per-iteration send budget.
+
+    Producers enqueue ``(dgram, addr)`` pairs and return immediately;
+    the consumer thread drains at most BUDGET items per wakeup through
+    a non-blocking sendto, waiting on selector writability when the
+    socket buffer is full.  The broadcast tick never blocks on the
+    network, and a slow receiver back-pressures into the queue instead
+    of into the frame loop.
+    """
+
+    BUDGET = 16
+
+    def __init__(self):
+        # Own socket, never the SimpleUDPClient's: making the shared
+        # socket non-blocking would leak BlockingIOError into the
+        # synchronous send() path, which carries no try/except.
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._queue = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def enqueue(self, dgram: bytes, addr) -> None:
+        self._queue.put((dgram, addr))
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sock.close()
+
+    def _run(self) -> None:
+        sel = selectors.DefaultSelector()
+        sel.register(self._sock, selectors.EVENT_WRITE)
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = self._queue.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                sent = 0
+                while item is not None:
+                    dgram, addr = item
+                    while True:
+                        try:
+                            self._sock.sendto(dgram, addr)
+                            break
+                        except BlockingIOError:
+                            sel.select(0.2)
+                            if self._stop.is_set():
+                                return
+                        except OSError:
+                            break  # unroutable etc.: drop the datagram
+                    sent += 1
+                    if sent >= self.BUDGET:
+                        break  # yield; the rest waits for the next wakeup
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+        finally:
+            sel.close()
+
+
+class OSCMapper:
+    """Binds the command registry and app state to an OSCClient."""
+
+    # Broadcast addresses, fixed at class level: the per-tick loop never
+    # formats a string.
+    ADDR_POSITION = "/snn/state/position"
+    ADDR_PLAYING = "/snn/state/playing"
+    ADDR_SPEED = "/snn/state/speed"
+    ADDR_TAU_A = "/snn/state/tau_a"
+    ADDR_TAU_R = "/snn/state/tau_r"
+    ADDR_THRESHOLD = "/snn/state/threshold"
+    ADDR_REFRACTORY = "/snn/state/refractory"
+
+    # Bundle header (IMMEDIATELY timetag) and per-address message
+    # templates: a size-prefixed header to concatenate with the packed
+    # 4-byte payload.  The hot path never touches a message builder.
+    _BUNDLE_PREFIX = b"#bundle\x00" + b"\x00\x00\x00\x00\x00\x00\x00\x01"
+    _MSG_TEMPLATES = {
+        ADDR_POSITION: (_bundle_element_template(ADDR_POSITION, b"f"), ">f"),
+        ADDR_PLAYING: (_bundle_element_template(ADDR_PLAYING, b"i"), ">i"),
+        ADDR_SPEED: (_bundle_element_template(ADDR_SPEED, b"f"), ">f"),
+        ADDR_TAU_A: (_bundle_element_template(ADDR_TAU_A, b"f"), ">f"),
+        ADDR_TAU_R: (_bundle_element_template(ADDR_TAU_R, b"f"), ">f"),
+        ADDR_THRESHOLD: (_bundle_element_template(ADDR_THRESHOLD, b"f"), ">f"),
+        ADDR_REFRACTORY: (_bundle_element_template(ADDR_REFRACTORY, b"f"), ">f"),
+    }
+
+    # While playing, the position dirty bit is set every frame; cap its
+    # broadcasts at 20 Hz instead of once per render tick.
+    _POSITION_INTERVAL_NS = 50_000_000
+
+    def __init__(self, client: OSCClient, command_registry, app_state):
+        self.client = client
+        self.registry = command_registry
+        self.state = app_state
+        # Last value broadcast per address: unchanged fields are skipped,
+        # so an idle app sends nothing at all.
+        self._last_sent: Dict[str, object] = {}
+        self._last_pos_sent_ns = 0
+        self._sender: Optional[_AsyncSender] = None
+        self._register_command_handlers()
+
+    def _register_command_handlers(self) -> None:
+        # One bound method serves every address; the command is found by
+        # dict lookup in _dispatch, so no per-command closure objects are
+        # allocated at registration.
+        self._cmd_by_addr: Dict[str, object] = {}
+        for command in self.registry.list_all(include_hidden=True):
+            # CommandDef builds its OSC address once at construction; read
+            # the cached attribute directly rather than through the getter.
+            self._cmd_by_addr[command._osc_address] = command
+            self.client.register_handler(command._osc_address, self._dispatch)
+
+    def _dispatch(self, address: str, *args) -> None:
+        cmd = self._cmd_by_addr.get(address)
+        if cmd is None:
+            return
+        try:
+            cmd.invoke([str(a) for a in args])
+        except (ValueError, TypeError):
+            pass
+
+    def send_state_updates(self) -> None:
+        """Broadcast changed transport/kernel state as one OSC bundle.
+
+        The dirty bitmaps on Transport and KernelParams say which fields
+        moved since the last broadcast; only those ride in the bundle,
+        so an idle app touches nothing and sends nothing.  All changed
+        fields share a single datagram — one syscall per tick at most.
+        """
+        if not self.client.enabled or not OSC_AVAILABLE:
+            return
+        transport = self.state.transport
+        kernel = self.state.kernel
+        t_dirty = transport._dirty
+        k_dirty = kernel._dirty
+        if not (t_dirty or k_dirty):
+            return
+        if t_dirty & transport.DIRTY_POSITION and transport.playing:
+            now_ns = time.monotonic_ns()
+            if now_ns - self._last_pos_sent_ns < self._POSITION_INTERVAL_NS:
+                # Withhold position this tick; the bit stays set on the
+                # transport so the next eligible tick picks it up.
+                t_dirty &= ~transport.DIRTY_POSITION
+            else:
+                self._last_pos_sent_ns = now_ns
+        fields = []
+        if t_dirty & transport.DIRTY_POSITION:
+            fields.append((self.ADDR_POSITION, float(transport.position)))
+        if t_dirty & transport.DIRTY_PLAYING:
+            fields.append((self.ADDR_PLAYING, int(transport.playing)))
+        if t_dirty & transport.DIRTY_SPEED:
+            fields.append((self.ADDR_SPEED, float(transport.speed)))
+        if k_dirty & kernel.DIRTY_TAU_A:
+            fields.append((self.ADDR_TAU_A, float(kernel.tau_a)))
+        if k_dirty & kernel.DIRTY_TAU_R:
+            fields.append((self.ADDR_TAU_R, float(kernel.tau_r)))
+        if k_dirty & kernel.DIRTY_THRESHOLD:
+            fields.append((self.ADDR_THRESHOLD, float(kernel.threshold)))
+        if k_dirty & kernel.DIRTY_REFRACTORY:
+            fields.append((self.ADDR_REFRACTORY, float(kernel.refractory)))
+        transport._dirty &= ~t_dirty
+        kernel._dirty = 0
+        last = self._last_sent
+        templates = self._MSG_TEMPLATES
+        pack = struct.pack
+        parts = None
+        for address, value in fields:
+            if last.get(address) == value:
+                continue
+            last[address] = value
+            if parts is None:
+                parts = [self._BUNDLE_PREFIX]
+            header, fmt = templates[address]
+            parts.append(header + pack(fmt, value))
+        if parts is None:
+            return
+        if self._sender is None:
+            self._sender = _AsyncSender()
+        self._sender.enqueue(b"".join(parts), (self.client.host, self.client.send_port))
+
+    def close(self) -> None:
+        if self._sender is not None:
+            self._sender.stop()
+            self._sender = None
+
+    # Per-command block for the spec document: one formatted write per
+    # command instead of six list appends and a trailing join.
+    _SPEC_COMMAND_BLOCK = "### {address}\n\n{help}\n\nSignature: `{signature}`\n\n"
+
+    def create_osc_spec_document(self, filepath: str) -> None:
+        """Write the OSC address reference as markdown."""
+        buf = io.StringIO()
+        w = buf.write
+        w("# OSC API\n\n")
+        w(f"Send to port {self.client.send_port}, listen on {self.client.recv_port}.\n\n")
+        w("## Commands\n\n")
+        block = self._SPEC_COMMAND_BLOCK
+        for command in self.registry.list_all(include_hidden=True):
+            w(block.format(
+                address=command._osc_address,
+                help=command.help or "(no description)",
+                signature=command._osc_signature or "no args",
+            ))
+        w("## State broadcasts\n\n")
+        for path in ("position", "playing", "speed", "tau_a", "tau_r", "threshold", "refractory"):
+            w(f"- `/snn/state/{path}`\n")
+        w("\n")
+        with open(filepath, "w") as f:
+            f.write(buf.getvalue())
@@ -0,0 +1,375 @@
+"""Application state for the scope TUI.
+
+Everything the render loop and the command layer share lives here:
+channels, markers, transport, kernel parameters, and the top-level
+:class:`AppState` aggregate.  OSC and the command registry observe and
+mutate this state; they do not own any of it.
+"""
+
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+@dataclass(slots=True)
+class Marker:
+    """A labelled point on the timeline."""
+
+    time: float
+    label: str
+    color: int = 0
+
+
+class MarkerManager:
+    """Timeline markers, kept sorted by time.
+
+    Structure-of-arrays: a bisect-maintained time array parallel to the
+    marker list, plus a label dict.  Label lookups and removals are O(1)
+    dict work, the time searches are O(log N), and add is a binary
+    search plus insert instead of a full re-sort.
+    """
+
+    def __init__(self):
+        self._times: List[float] = []
+        self._by_time: List[Marker] = []
+        self._by_label: dict = {}
+
+    @property
+    def markers(self) -> List[Marker]:
+        """Markers in time order (shared list; treat as read-only)."""
+        return self._by_time
+
+    def add(self, marker: Marker) -> None:
+        i = bisect_right(self._times, marker.time)
+        self._times.insert(i, marker.time)
+        self._by_time.insert(i, marker)
+        self._by_label[marker.label] = marker
+
+    def remove(self, label: str) -> bool:
+        # Dict pop plus bisect: no linear scan over the marker list to
+        # find the victim, only the unavoidable list deletion itself.
+        marker = self._by_label.pop(label, None)
+        if marker is None:
+            return False
+        i = bisect_left(self._times, marker.time)
+        while self._by_time[i] is not marker:  # equal-time neighbors
+            i += 1
+        del self._times[i]
+        del self._by_time[i]
+        return True
+
+    def get_by_label(self, label: str) -> Optional[Marker]:
+        return self._by_label.get(label)
+
+    def find_next(self, position: float) -> Optional[Marker]:
+        i = bisect_right(self._times, position)
+        return self._by_time[i] if i < len(self._by_time) else None
+
+    def find_prev(self, position: float) -> Optional[Marker]:
+        i = bisect_left(self._times, position)
+        return self._by_time[i - 1] if i else None
+
+    def find_nearest(self, position: float) -> Optional[Marker]:
+        if not self._by_time:
+            return None
+        i = bisect_left(self._times, position)
+        if i == 0:
+            return self._by_time[0]
+        if i == len(self._by_time):
+            return self._by_time[-1]
+        before, after = self._by_time[i - 1], self._by_time[i]
+        return before if position - before.time <= after.time - position else after
+
+    def clear(self) -> None:
+        self._times = []
+        self._by_time = []
+        self._by_label = {}
+
+
+@dataclass(slots=True)
+class Channel:
+    """Per-channel display settings."""
+
+    channel_id: int
+    visible: bool = True
+    gain: float = 1.0
+    offset: float = 0.0
+    color: int = 0
+    label: str = ""
+
+
+class ChannelManager:
+    """The scope's four input channels."""
+
+    NUM_CHANNELS = 4
+
+    def __init__(self):
+        self.channels: List[Channel] = [
+            Channel(i, color=i + 1, label=f"ch{i}") for i in range(self.NUM_CHANNELS)
+        ]
+        # Visibility as a 4-bit mask, with all 16 possible visible-channel
+        # tuples prebuilt: the per-frame all_visible() call is a single
+        # indexed read, no filtering or allocation.
+        self._visible_mask = (1 << self.NUM_CHANNELS) - 1
+        self._visible_cache = tuple(
+            tuple(ch for ch in self.channels if mask >> ch.channel_id & 1)
+            for mask in range(1 << self.NUM_CHANNELS)
+        )
+
+    def get(self, channel_id: int) -> Optional[Channel]:
+        if 0 <= channel_id < len(self.channels):
+            return self.channels[channel_id]
+        return None
+
+    def all_visible(self) -> tuple:
+        return self._visible_cache[self._visible_mask]
+
+    def toggle_visibility(self, channel_id: int) -> None:
+        # One get() per mutator: each call re-ran the bounds check, so
+        # the read-modify-write paths paid it two or three times over.
+        ch = self.get(channel_id)
+        if ch is not None:
+            ch.visible = not ch.visible
+            self._visible_mask ^= 1 << channel_id
+
+    def multiply_gain(self, channel_id: int, factor: float) -> None:
+        ch = self.get(channel_id)
+        if ch is not None:
+            ch.gain *= factor
+
+    def adjust_offset(self, channel_id: int, delta: float) -> None:
+        ch = self.get(channel_id)
+        if ch is not None:
+            ch.offset += delta
+
+
+@dataclass(slots=True)
+class Transport:
+    """Playback position and rate.
+
+    Position is tracked as integer monotonic nanoseconds: no wall-clock
+    jumps, no cumulative float drift from accumulating small dt values,
+    and the end-of-duration check is an integer compare.
+    """
+
+    # Dirty bits for the OSC broadcaster: mutations OR these in (via
+    # __setattr__, so direct field assignment counts too) and the
+    # broadcaster reads and clears them, sending only what changed.
+    DIRTY_POSITION = 1
+    DIRTY_PLAYING = 2
+    DIRTY_SPEED = 4
+    _DIRTY_BITS = {"_pos_ns": DIRTY_POSITION, "playing": DIRTY_PLAYING, "speed": DIRTY_SPEED}
+
+    playing: bool = False
+    speed: float = 1.0
+    loop: bool = False
+    duration: float = 0.0
+    _pos_ns: int = field(default=0, repr=False)
+    _last_ns: int = field(default=0, repr=False)
+    _tau: object = field(default=None, repr=False)
+    _dirty: int = field(default=DIRTY_POSITION | DIRTY_PLAYING | DIRTY_SPEED, repr=False)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        bit = self._DIRTY_BITS.get(name)
+        if bit is not None:
+            try:
+                object.__setattr__(self, "_dirty", self._dirty | bit)
+            except AttributeError:  # still inside __init__, default covers it
+                pass
+
+    @property
+    def position(self) -> float:
+        return self._pos_ns * 1e-9
+
+    @position.setter
+    def position(self, value: float) -> None:
+        self._pos_ns = int(value * 1e9)
+
+    def _ensure_tau(self):
+        # The engine client is only needed when playback actually talks
+        # to the engine; headless state manipulation never imports it.
+        if self._tau is None:
+            from tau_lib.devices import TetraDevices
+
+            self._tau = TetraDevices()
+        return self._tau
+
+    def toggle_play(self, now_ns: Optional[int] = None) -> bool:
+        self.playing = not self.playing
+        self._last_ns = time.monotonic_ns() if now_ns is None else now_ns
+        return self.playing
+
+    def tick(self, now_ns: int) -> None:
+        """Advance the position to ``now_ns``; call once per frame.
+
+        The frame loop reads ``time.monotonic_ns()`` once and hands the
+        same timestamp to every subsystem, so the clock is sampled once
+        per frame rather than once per consumer.
+        """
+        if not self.playing:
+            return
+        self._pos_ns += int((now_ns - self._last_ns) * self.speed)
+        self._last_ns = now_ns
+        duration_ns = int(self.duration * 1e9)
+        if duration_ns and self._pos_ns >= duration_ns:
+            if self.loop:
+                self._pos_ns -= duration_ns
+            else:
+                self._pos_ns = duration_ns
+                self.playing = False
+
+    def update(self) -> None:
+        """Advance against the clock directly; prefer tick() in the frame loop."""
+        self.tick(time.monotonic_ns())
+
+    def seek(self, position: float) -> None:
+        self._pos_ns = max(0, int(position * 1e9))
+
+
+# Argument-vector memo for to_tscale_args: between parameter edits every
+# call sees the same values, so the eight float->str conversions happen
+# once per distinct parameter set.  Bounded — live OSC automation can
+# sweep the knobs through arbitrarily many distinct tuples, and an
+# unbounded dict would keep every one for the life of the session.
+@lru_cache(maxsize=128)
+def _tscale_args(tau_a: float, tau_r: float, threshold: float, refractory: float) -> tuple:
+    return (
+        "-a", str(tau_a),
+        "-r", str(tau_r),
+        "-t", str(threshold),
+        "-d", str(refractory),
+    )
+
+
+@dataclass(slots=True)
+class KernelParams:
+    """Dual-tau kernel parameters mirrored to the tscale binary."""
+
+    # Dirty bits, same contract as Transport: writers OR in, the OSC
+    # broadcaster reads and clears.
+    DIRTY_TAU_A = 1
+    DIRTY_TAU_R = 2
+    DIRTY_THRESHOLD = 4
+    DIRTY_REFRACTORY = 8
+    _DIRTY_BITS = {
+        "tau_a": DIRTY_TAU_A,
+        "tau_r": DIRTY_TAU_R,
+        "threshold": DIRTY_THRESHOLD,
+        "refractory": DIRTY_REFRACTORY,
+    }
+
+    tau_a: float = 0.001
+    tau_r: float = 0.010
+    threshold: float = 0.5
+    refractory: float = 0.002
+    _dirty: int = field(default=0b1111, repr=False)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        bit = self._DIRTY_BITS.get(name)
+        if bit is not None:
+            try:
+                object.__setattr__(self, "_dirty", self._dirty | bit)
+            except AttributeError:  # still inside __init__, default covers it
+                pass
+
+    def to_tscale_args(self) -> tuple:
+        return _tscale_args(self.tau_a, self.tau_r, self.threshold, self.refractory)
+
+    def copy(self) -> "KernelParams":
+        return KernelParams(self.tau_a, self.tau_r, self.threshold, self.refractory)
+
+
+@dataclass(frozen=True, slots=True)
+class LayoutConfig:
+    """Static geometry of the TUI.
+
+    Immutable: the default instance is interned and shared by every
+    AppState, so derive changed layouts with :func:`dataclasses.replace`
+    rather than mutating in place.
+    """
+
+    lane_height: int = 8
+    gutter_width: int = 10
+    show_status_bar: bool = True
+    show_help: bool = False
+
+
+@lru_cache(None)
+def default_layout() -> LayoutConfig:
+    """The shared all-defaults layout; safe because LayoutConfig is frozen."""
+    return LayoutConfig()
+
+
+@dataclass(slots=True)
+class FeatureFlags:
+    """Optional subsystems toggled at runtime."""
+
+    osc_enabled: bool = False
+    video_enabled: bool = False
+    follow_playhead: bool = True
+
+
+@dataclass(slots=True)
+class DisplayState:
+    """Viewport over the data buffer."""
+
+    view_start: float = 0.0
+    view_duration: float = 5.0
+    theme: str = "dark"
+    fps: int = 30
+
+
+@dataclass(slots=True)
+class AppState:
+    """Everything the render loop needs, in one place.
+
+    Sample data is structure-of-arrays: ``times`` is float64[N] and
+    ``values`` is float32[N, C], one column per channel.  Windowing is a
+    ``np.searchsorted`` plus a slice instead of a Python loop over
+    per-sample tuples, and the buffer costs two arrays rather than one
+    object (plus one sublist) per sample.
+    """
+
+    times: Optional["np.ndarray"] = None
+    values: Optional["np.ndarray"] = None
+    channels: ChannelManager = field(default_factory=ChannelManager)
+    markers: MarkerManager = field(default_factory=MarkerManager)
+    transport: Transport = field(default_factory=Transport)
+    kernel: KernelParams = field(default_factory=KernelParams)
+    layout: LayoutConfig = field(default_factory=default_layout)
+    flags: FeatureFlags = field(default_factory=FeatureFlags)
+    display: DisplayState = field(default_factory=DisplayState)
+    num_columns: int = field(default=4, init=False)
+    _lanes: object = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.values is not None:
+            self.num_columns = self.values.shape[1]
+
+    def window(self, left: float, right: float):
+        """Rows with ``left <= time < right`` as (times, values) views."""
+        if self.times is None:
+            return None, None
+        lo = np.searchsorted(self.times, left)
+        hi = np.searchsorted(self.times, right)
+        return self.times[lo:hi], self.values[lo:hi]
+
+    @property
+    def lanes(self):
+        # Built on first access (same pattern as Transport._ensure_tau):
+        # headless entry points that never render pay neither the lanes
+        # import nor the LaneManager construction.
+        if self._lanes is None:
+            from tau_lib.lanes import LaneManager
+
+            self._lanes = LaneManager(ChannelManager.NUM_CHANNELS)
+        return self._lanes